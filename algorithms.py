@@ -1,22 +1,142 @@
+import random
+import tempfile
 import time
+from array import array
+
+DEFAULT_INITIAL = [1, 5, 8, 6, 3, 7, 2, 4]    # the app's default configuration (1-based rows, n = 8)
+STOP_EVENTS = ('solution', 'invalid', 'done')   # events after which stepping makes no progress
+
+
+def event_payload(solver, event):
+    ''' The data dict step() returns with an event, built from the solver's
+        last move (solver.last = (col, row)) and current state '''
+    col, row = solver.last
+    if event == 'fixed':
+        return {'col': col, 'state': solver.state(), 'row': row}
+    if event in ('searching', 'backtracking'):
+        return {'col': col, 'row': row}
+    if event == 'invalid':
+        return {'col': col}
+    return {'state': solver.state()}
+
+
+def run_to_end(solver, max_nodes=None):
+    ''' Drive solver.advance() until the search stops or max_nodes is reached.
+        No event payloads are built; nodes are counted exactly as with step(). '''
+    if solver.start_time is None: solver.start_time = time.time()   # start timer
+    advance = solver.advance
+    result = None
+    while result not in STOP_EVENTS:
+        if max_nodes is not None and solver.nodes >= max_nodes:
+            result = 'limit'
+            break
+        result = advance()
+    return {'result': result, 'state': solver.state(), 'nodes': solver.nodes,
+            'time': time.time() - solver.start_time}
+
+
+def iter_events(solver):
+    ''' Generator over (event, data) pairs as step() would return them, built
+        only when the consumer asks for the next one; stops after the last event '''
+    while True:
+        event = solver.advance()
+        yield event, event_payload(solver, event)
+        if event in STOP_EVENTS:
+            return
 
 # ==========================================
 # 1. BFS SOLVER
 # ==========================================
+class Frontier:
+    ''' One BFS level: states of `depth` rows each, packed end to end in an
+        array (stride = depth). Past memory_limit bytes the buffer is spilled
+        to a temporary file, and iteration reads it back in chunks. '''
+    def __init__(self, depth, typecode='B', memory_limit=None):
+        self.depth = depth
+        self.typecode = typecode
+        self.memory_limit = memory_limit
+        self.buffer = array(typecode)
+        self.spill = None   # temp file holding the states before self.buffer
+        self.spilled = 0    # states written to the spill file
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def append(self, parent, row):
+        ''' Add the state parent + (row,) '''
+        self.buffer.extend(parent)
+        self.buffer.append(row)
+        self.count += 1
+        if self.memory_limit is not None and self.buffer.itemsize * len(self.buffer) >= self.memory_limit:
+            if self.spill is None:
+                self.spill = tempfile.TemporaryFile()
+            self.buffer.tofile(self.spill)
+            self.spilled = self.count
+            self.buffer = array(self.typecode)
+
+    def __iter__(self):
+        ''' Each state as an array of rows, in insertion order '''
+        depth = self.depth
+        if depth == 0:
+            for _ in range(self.count):
+                yield array(self.typecode)
+            return
+        if self.spill is not None:
+            self.spill.seek(0)
+            per_chunk = max(1, (self.memory_limit or 1 << 20) // (depth * self.buffer.itemsize))
+            left = self.spilled
+            while left:
+                chunk = array(self.typecode)
+                chunk.fromfile(self.spill, min(per_chunk, left) * depth)
+                left -= len(chunk) // depth
+                for i in range(0, len(chunk), depth):
+                    yield chunk[i:i + depth]
+        buffer = self.buffer
+        for i in range(0, len(buffer), depth):
+            yield buffer[i:i + depth]
+
+    def close(self):
+        if self.spill is not None:
+            self.spill.close()
+            self.spill = None
+
+
 class BFSSolver:
-    def __init__(self, n=8):
+    ''' Breadth-first search over partial placements, one column per level.
+        Every state of level d (queens in columns 0..d-1) is expanded before any
+        of level d + 1; children try the user's row first, then cycle downward.
+        Each step tries one child: 'searching' if it attacks the parent's queens,
+        'fixed' if it joins the next level (the event state is the child), and
+        'solution' once a child fills the last column. level_counts[d] is the
+        number of conflict-free states found at depth d. With memory_limit
+        (bytes) a level larger than that is spilled to a temporary file. '''
+    def __init__(self, n=8, memory_limit=None):
         self.n = n
+        self.memory_limit = memory_limit
+        self.typecode = 'B' if n <= 256 else 'H'
         self.reset()
 
     def reset(self):
         self.start_time = None
         self.nodes = 0  # No nodes expanded at start
         self.initial = [0] * self.n  # Default to 0s
-        self.fixed = []  # No fixed queens at start   
-        self.col = 0
+        self.fixed = []  # queens of the state being expanded (or the child just added)
+        self.col = 0    # depth of the level being expanded
         self.valid = True
         self.finished = False
-        self.trial_step = 0 
+        self.trial_step = self.n    # children tried for the current parent (n -> take the next parent)
+        self.last = (0, None)   # (col, row) of the last step, for event payloads
+        # level being expanded (level 0 is the empty board) and the one being filled
+        self.frontier = Frontier(0, self.typecode)
+        self.frontier.count = 1
+        self.next_frontier = Frontier(1, self.typecode, self.memory_limit)
+        self.parents = iter(self.frontier)
+        self.parent = None  # state being expanded, as an array and as a list
+        self.parent_rows = []
+        self.level_counts = [1]     # states per depth (the last one stops at the first solution)
+        # occupancy masks of the parent's queens
+        self.rows = self.diag = self.anti = 0
 
     def set_initial(self, rows):
         # 1. Reset first to clear old state
@@ -24,59 +144,98 @@ class BFSSolver:
         
         # 2. Apply User Input (User input is 1-based i.e. 1-8, convert to 0-based i.e. 0-7)
         self.initial = [r - 1 for r in rows[:]] 
-        
-        # (Note: BFS doesn't pre-calculate domains, it just uses self.initial dynamically in get_current_trial_row)
 
     def conflict_with_fixed(self, col, row):
-        ''' Get column and row for fixed queens 
-            and determines conflict with fixed queens. '''
-        for c, r in enumerate(self.fixed):
-            # Row constraint
-            if r == row: 
-                return True
-            # Diagonal constraint
-            if abs(c - col) == abs(r - row): 
-                return True
-        return False
+        ''' Determines conflict of (col, row) with the queens of the parent state. '''
+        return bool(self.rows >> row & 1 or self.diag >> (row - col + self.n - 1) & 1 or self.anti >> (row + col) & 1)
 
     def get_current_trial_row(self):
         ''' Gets the row to try in this column.
-            Start from user\’s preferred row, then cycle downward. '''
+            Start from user’s preferred row, then cycle downward. '''
         start_row = self.initial[self.col]  # User initial row configuration
         return (start_row + self.trial_step) % self.n   # Wraps around the board
 
+    def next_parent(self):
+        ''' Move on to the next state to expand, starting the next level when
+            this one is used up. False if there is nothing left to expand. '''
+        parent = next(self.parents, None)
+        if parent is None:
+            self.frontier.close()
+            if not len(self.next_frontier):
+                return False
+            # next level
+            self.col += 1
+            self.level_counts.append(len(self.next_frontier))
+            self.frontier = self.next_frontier
+            self.next_frontier = Frontier(self.col + 1, self.typecode, self.memory_limit)
+            self.parents = iter(self.frontier)
+            parent = next(self.parents)
+        self.parent = parent
+        self.parent_rows = parent.tolist()
+        self.trial_step = 0
+        n = self.n
+        self.rows = self.diag = self.anti = 0
+        for c, r in enumerate(self.parent_rows):
+            self.rows |= 1 << r
+            self.diag |= 1 << (r - c + n - 1)
+            self.anti |= 1 << (r + c)
+        return True
+
+    def state(self):
+        return self.fixed[:]
+
     def step(self):
+        event = self.advance()
+        return event, event_payload(self, event)
+
+    def solve(self, max_nodes=None):
+        ''' Run to the end without step() events; returns result, state, nodes and time '''
+        return run_to_end(self, max_nodes)
+
+    def events(self):
+        ''' Lazy generator of step() events '''
+        return iter_events(self)
+
+    def advance(self):
+        ''' One step of the search, returning only the event name '''
         if self.start_time is None: self.start_time = time.time()   # start timer
         self.nodes += 1
 
         # check for invalid configuration or finished message
         if not self.valid or self.finished:
-            return 'done', {'state': self.fixed[:]}
+            return 'done'
 
-        # when board is finished and solution is found
+        # a child filled the last column: solution
         if self.col >= self.n:
             self.finished = True
-            return 'solution', {'state': self.fixed[:]}
-
-        # when board is not completed and searching for positions
-        if self.trial_step < self.n:
-            r = self.get_current_trial_row()
-            # if no conflict with previously placed queens (add to fixed)
-            if not self.conflict_with_fixed(self.col, r):
-                self.fixed.append(r)
-                self.trial_step = 0
-                self.col += 1
-                return 'fixed', {'col': self.col - 1, 'state': self.fixed[:], 'row': r}
-            # if conflict is found, change row
-            else:
-                current_r = r
-                self.trial_step += 1
-                return 'searching', {'col': self.col, 'row': current_r}
-        
-        # when board is completed and invalid configuration (generate invalid message)
-        else: 
-            self.valid = False
-            return 'invalid', {'col': self.col}
+            self.next_frontier.close()
+            return 'solution'
+
+        # current parent fully expanded -> take the next one (or the next level)
+        if self.trial_step >= self.n:
+            if not self.next_parent():
+                # every level was expanded without reaching the last column
+                self.valid = False
+                self.last = (self.col, None)
+                return 'invalid'
+
+        col = self.col
+        r = self.get_current_trial_row()
+        self.trial_step += 1
+        self.last = (col, r)
+
+        # if conflict is found, try the next row
+        if self.conflict_with_fixed(col, r):
+            self.fixed = self.parent_rows
+            return 'searching'
+
+        # no conflict: the child joins the next level
+        self.next_frontier.append(self.parent, r)
+        self.fixed = self.parent_rows + [r]
+        if col + 1 == self.n:
+            self.level_counts.append(len(self.next_frontier))
+            self.col = self.n   # reported as 'solution' on the next step
+        return 'fixed'
 
 
 
@@ -84,9 +243,30 @@ class BFSSolver:
 # 2. CSP SOLVER
 # ==========================================
 class CSPSolver:
-    ''' Constraint propagation and backtracking algorithm '''
-    def __init__(self, n=8):
+    ''' Constraint propagation and backtracking algorithm.
+        With trail=True the backtrack stack keeps only the rows removed at each
+        level (an undo log) instead of a full copy of every domain.
+
+        variable picks the next column: 'static' (left to right) or 'mrv'
+        (fewest rows left, ties to the column whose rows rule out the most
+        values elsewhere, i.e. highest degree). value orders a column's rows:
+        'preferred' (user's row first, then ascending) or 'lcv' (rows that rule
+        out the fewest values elsewhere first, user's row breaking ties).
+        With 'mrv' columns are filled out of order, so fixed holds rows in the
+        order they were placed and event states are per-column boards with
+        None in empty columns. '''
+    VARIABLE_ORDERS = ('static', 'mrv')
+    VALUE_ORDERS = ('preferred', 'lcv')
+
+    def __init__(self, n=8, trail=False, variable='static', value='preferred'):
+        if variable not in self.VARIABLE_ORDERS:
+            raise ValueError(f"variable must be one of {self.VARIABLE_ORDERS}, not {variable!r}")
+        if value not in self.VALUE_ORDERS:
+            raise ValueError(f"value must be one of {self.VALUE_ORDERS}, not {value!r}")
         self.n = n
+        self.trail = trail
+        self.variable = variable
+        self.value = value
         self.reset()    # reset board
 
     def reset(self):
@@ -97,8 +277,11 @@ class CSPSolver:
         self.col = 0
         self.valid = True
         self.finished = False
-        self.stack = []  # to hold past states for backtracking
+        self.stack = []  # to hold past states (or undo logs in trail mode) for backtracking
         self.domains = []   # to hold possible values for each queen
+        self.assigned = [False] * self.n    # columns holding a queen
+        self.last = (0, None)   # (col, row) of the last step, for event payloads
+        self.exact = True   # False once update_initial may have led away from a fresh solve's result
 
     def set_initial(self, rows):
         # 1. Reset first to clear state (stack, fixed, etc.)
@@ -119,11 +302,75 @@ class CSPSolver:
                 domain.insert(0, preferred)     # then insert back at first position i.e. 0 index
             self.domains.append(domain)   # append domain of that column to self.domains
 
+        # 4. Pick the first column (heuristics only)
+        if self.variable != 'static':
+            self.col = self.select_column()
+        if self.value == 'lcv':
+            self.order_values(self.col)
+
+    def future(self, assigned_col):
+        ''' Columns still to be filled once assigned_col gets its queen '''
+        if self.variable == 'static':
+            return range(assigned_col + 1, self.n)
+        return [c for c in range(self.n) if not self.assigned[c] and c != assigned_col]
+
+    def line_counts(self):
+        ''' Values left in the empty columns per row, diagonal and anti-diagonal, O(n^2) '''
+        n = self.n
+        rows, diag, anti = [0] * n, [0] * (2 * n - 1), [0] * (2 * n - 1)
+        for c in range(n):
+            if not self.assigned[c]:
+                for r in self.domains[c]:
+                    rows[r] += 1
+                    diag[r - c + n - 1] += 1
+                    anti[r + c] += 1
+        return rows, diag, anti
+
+    def ruled_out(self, col, row, counts):
+        ''' How many values in the other empty columns a queen on (col, row) would
+            remove, in O(1): the values on its lines, less its own 3 (row is in col's domain) '''
+        rows, diag, anti = counts
+        return rows[row] + diag[row - col + self.n - 1] + anti[row + col] - 3
+
+    def select_column(self):
+        ''' MRV: empty column with the fewest rows left, ties broken by degree
+            (most values ruled out in other columns), then leftmost. n if all are filled. '''
+        empty = [c for c in range(self.n) if not self.assigned[c]]
+        if not empty:
+            return self.n
+        fewest = min(len(self.domains[c]) for c in empty)
+        tied = [c for c in empty if len(self.domains[c]) == fewest]
+        if len(tied) == 1:
+            return tied[0]
+        counts = self.line_counts()
+        def degree(col):
+            return sum(self.ruled_out(col, r, counts) for r in self.domains[col])
+        return max(tied, key=degree)     # max keeps the leftmost of equal degrees
+
+    def order_values(self, col):
+        ''' LCV: sort the rows of col so the least constraining come first '''
+        if col >= self.n:
+            return
+        counts = self.line_counts()
+        preferred = self.initial[col]
+        self.domains[col].sort(key=lambda r: (self.ruled_out(col, r, counts), -1 if r == preferred else r))
+
+    def board(self):
+        ''' Row per column, None where no queen is placed yet '''
+        rows = [None] * self.n
+        for c, _, r in self.stack:
+            rows[c] = r
+        return rows
+
+    def state(self):
+        ''' Board for event payloads: fixed itself unless columns are filled out of order '''
+        return self.fixed[:] if self.variable == 'static' else self.board()
+
     def forward_check(self, assigned_col, assigned_row, current_domains):
         ''' Checks if assigning a row allows future placements or not '''
         new_domains = [d[:] for d in current_domains]   # copy of domains
-        # loop from assigned column to last
-        for c in range(assigned_col + 1, self.n):
+        # loop over the columns still to be filled
+        for c in self.future(assigned_col):
             # add values in new_domains of column 'c' if it does not violate row and diagonal constraints
             new_domains[c] = [
                 r for r in new_domains[c] 
@@ -135,47 +382,1130 @@ class CSPSolver:
         # return domains
         return new_domains
 
+    def snapshot(self):
+        ''' Copy of every domain, pushed on the stack in snapshot (non-trail) mode '''
+        return [d[:] for d in self.domains]
+
+    def forward_check_trail(self, assigned_col, assigned_row):
+        ''' Trail mode forward check: prunes self.domains in place and returns
+            the removed rows as [(col, rows), ...], or None if a domain empties '''
+        pruned = []
+        # loop over the columns still to be filled
+        for c in self.future(assigned_col):
+            kept, removed = [], []
+            for r in self.domains[c]:
+                if r != assigned_row and abs(c - assigned_col) != abs(r - assigned_row):
+                    kept.append(r)
+                else:
+                    removed.append(r)
+            # if no value available in the domain, return None (domains are left untouched)
+            if not kept:
+                return None
+            if removed:
+                pruned.append((c, kept, removed))
+        # commit the pruned domains and hand back only what was removed
+        trail = []
+        for c, kept, removed in pruned:
+            self.domains[c] = kept
+            trail.append((c, removed))
+        return trail
+
+    def undo(self, trail):
+        ''' Put rows logged in a trail back into their domains, keeping the
+            user's preferred row first and the rest in ascending order. Domain
+            and log are both already in that order, so the sort only merges
+            two ascending runs (linear, no key function). '''
+        domains, initial = self.domains, self.initial
+        for c, removed in trail:
+            if not removed:
+                continue
+            rows = domains[c] + removed
+            rows.sort()
+            preferred = initial[c]
+            if preferred in rows:
+                rows.remove(preferred)
+                rows.insert(0, preferred)
+            domains[c] = rows
+
+    def backtrack(self):
+        ''' Take back the last placed queen, restoring the domains; returns its (col, row) '''
+        prev_col, prev_domains, prev_row = self.stack.pop()
+        self.col = prev_col   # last column restore
+        self.fixed.pop()    # remove last incorrectly placed queen
+        self.assigned[prev_col] = False
+        if self.trail:
+            self.undo(prev_domains)   # replay undo log
+        else:
+            self.domains = prev_domains   # restore domain
+        return prev_col, prev_row
+
+    def update_initial(self, col, row):
+        ''' Change the preferred (1-based) row of one column without starting
+            over. In static/preferred order the columns before col are searched
+            exactly as before and every row already given up in col has no
+            completion under the current prefix, so the search is rewound to
+            col only: the queen placed there (if any) goes back into its domain
+            and the domain is reordered. Continuing finds the same solution a
+            fresh solve would. With heuristics the search restarts from scratch. '''
+        if self.variable != 'static' or self.value != 'preferred':
+            rows = [r + 1 for r in self.initial]
+            rows[col] = row
+            self.set_initial(rows)
+            return
+        self.initial[col] = row - 1
+        if not self.valid:
+            return  # no solution under any preference
+        if len(self.stack) > col:
+            while len(self.stack) > col + 1:
+                self.backtrack()
+            _, placed = self.backtrack()
+            self.domains[col].append(placed)
+            if self.trail and self.stack:
+                # the row was logged as tried on the level above: it is back in the domain now
+                self.stack[-1][1][-1][1].remove(placed)
+            self.finished = False
+        # preferred row first, then ascending (also in the saved domain copies)
+        key = lambda r: -1 if r == row - 1 else r
+        self.domains[col].sort(key=key)
+        if not self.trail:
+            for _, saved, _ in self.stack:
+                saved[col].sort(key=key)
+
     def step(self):
         ''' Step one time in solution '''
+        event = self.advance()
+        return event, event_payload(self, event)
+
+    def solve(self, max_nodes=None):
+        ''' Run to the end without step() events; returns result, state, nodes and time '''
+        return run_to_end(self, max_nodes)
+
+    def events(self):
+        ''' Lazy generator of step() events '''
+        return iter_events(self)
+
+    def advance(self):
+        ''' One step of the search, returning only the event name '''
         if self.start_time is None: self.start_time = time.time()   # start timer
         self.nodes += 1
 
         # return solution
         if self.finished:
-            return 'solution', {'state': self.fixed[:]}
+            return 'solution'
 
         # all columns completed
         if self.col >= self.n:
             self.finished = True
-            return 'solution', {'state': self.fixed[:]}
+            return 'solution'
 
         # Check if we are stuck (domain empty) -> Backtrack
         if not self.domains[self.col]:
             # if no previous state available, return invalid
             if not self.stack:
                 self.valid = False
-                return 'invalid', {'col': self.col}
+                self.last = (self.col, None)
+                return 'invalid'
             
             # backtracking now
-            prev_col, prev_domains, prev_row = self.stack.pop()
-            self.col = prev_col   # last column restore
-            self.fixed.pop()    # remove last incorrectly placed queen
-            self.domains = prev_domains   # restore domain
-            return 'backtracking', {'col': self.col, 'row': prev_row}
+            self.last = self.backtrack()
+            return 'backtracking'
 
         # Try next available row in domain (first tried user's row)
         r = self.domains[self.col].pop(0)
         
         # Check forward consistency
-        new_domains = self.forward_check(self.col, r, self.domains)
+        if self.trail:
+            # log the tried row on the level above, so backtracking past it restores the row
+            if self.stack:
+                self.stack[-1][1][-1][1].append(r)
+            saved = self.forward_check_trail(self.col, r)
+        else:
+            new_domains = self.forward_check(self.col, r, self.domains)
+            saved = None if new_domains is None else self.snapshot()
 
-        if new_domains is not None:
+        if saved is not None:
             # Valid move
-            self.stack.append((self.col, [d[:] for d in self.domains], r))  # add state to stack
+            col = self.col
+            self.stack.append((col, saved, r))  # add state to stack
             self.fixed.append(r)    # add to fixed queens
-            self.domains = new_domains
+            self.assigned[col] = True
+            if not self.trail:
+                self.domains = new_domains
+            # move to next column
+            if self.variable == 'static':
+                self.col += 1
+            else:
+                self.col = self.select_column()
+            if self.value == 'lcv':
+                self.order_values(self.col)
+            if self.trail:
+                saved.append((self.col, []))    # rows tried in the next column, one entry per level
+            self.last = (col, r)
+            return 'fixed'
+        else:
+            # Invalid move (causes future conflict)
+            self.last = (self.col, r)
+            return 'searching'
+
+
+def compare_heuristics(n, rows, max_nodes=None):
+    ''' Run CSPSolver with every variable/value ordering on one configuration
+        (1-based rows) and report nodes expanded, e.g. to pick a strategy '''
+    results = []
+    for variable in CSPSolver.VARIABLE_ORDERS:
+        for value in CSPSolver.VALUE_ORDERS:
+            solver = CSPSolver(n, trail=True, variable=variable, value=value)
+            solver.set_initial(rows)
+            out = solver.solve(max_nodes)
+            results.append({'variable': variable, 'value': value, 'result': out['result'],
+                            'nodes': out['nodes'], 'time': out['time']})
+    return results
+
+
+# ==========================================
+# 3. BITBOARD CSP SOLVER
+# ==========================================
+class BitboardCSPSolver:
+    ''' Constraint propagation and backtracking on integer bitmasks.
+        Same search order and step() events as CSPSolver, but rows,
+        diagonals and domains are ints instead of lists. '''
+    def __init__(self, n=8):
+        self.n = n
+        self.full = (1 << n) - 1    # bit r set -> row r available
+        self.reset()    # reset board
+
+    def reset(self):
+        self.start_time = None
+        self.nodes = 0
+        self.initial = [0] * self.n  # Default (initial)
+        self.fixed = []
+        self.col = 0
+        self.valid = True
+        self.finished = False
+        self.stack = []  # (col, remaining domain of col, row) per placed queen
+        self.domains = []   # bitmask of possible rows for each column
+        # occupancy masks of placed queens
+        self.rows = 0   # bit r -> row r taken
+        self.diag = 0   # bit (r - c + n - 1) -> diagonal taken
+        self.anti = 0   # bit (r + c) -> anti-diagonal taken
+        self.last = (0, None)   # (col, row) of the last step, for event payloads
+        self.exact = True   # False once update_initial may have led away from a fresh solve's result
+
+    def set_initial(self, rows):
+        # 1. Reset first to clear state (stack, fixed, etc.)
+        self.reset()
+
+        # 2. Apply User Input AFTER reset, so it doesn't get overwritten
+        self.initial = [r - 1 for r in rows[:]]
+
+        # 3. Every row is possible in every column before any queen is placed
+        self.domains = [self.full] * self.n
+
+    def free_rows(self, col, rows, diag, anti):
+        ''' Bitmask of rows in column col not attacked by the given occupancy masks '''
+        return self.full & ~(rows | (diag >> (self.n - 1 - col)) | (anti >> col))
+
+    def forward_check(self, assigned_col, assigned_row):
+        ''' Checks if assigning a row allows future placements or not.
+            On success the future domains are written into self.domains. '''
+        n = self.n
+        rows = self.rows | (1 << assigned_row)
+        diag = self.diag | (1 << (assigned_row - assigned_col + n - 1))
+        anti = self.anti | (1 << (assigned_row + assigned_col))
+        new_domains = []
+        # loop from assigned column to last
+        for c in range(assigned_col + 1, n):
+            domain = self.free_rows(c, rows, diag, anti)
+            # if no value available in the domain, return False (means backtracking required)
+            if not domain:
+                return False
+            new_domains.append(domain)
+        self.domains[assigned_col + 1:] = new_domains
+        return True
+
+    def next_row(self, domain):
+        ''' Row to try from a domain mask: user's preferred row first, then lowest row '''
+        preferred = self.initial[self.col]
+        if 0 <= preferred < self.n and domain >> preferred & 1:
+            return preferred
+        return (domain & -domain).bit_length() - 1
+
+    def place(self, col, row):
+        ''' Mark row and diagonals of a queen as taken '''
+        self.rows |= 1 << row
+        self.diag |= 1 << (row - col + self.n - 1)
+        self.anti |= 1 << (row + col)
+
+    def unplace(self, col, row):
+        ''' Clear row and diagonals of a queen '''
+        self.rows &= ~(1 << row)
+        self.diag &= ~(1 << (row - col + self.n - 1))
+        self.anti &= ~(1 << (row + col))
+
+    def backtrack(self):
+        ''' Take back the last placed queen; returns its (col, row). Only that
+            column's leftover rows need restoring, later columns are recomputed
+            by forward_check on the next placement. '''
+        prev_col, prev_domain, prev_row = self.stack.pop()
+        self.col = prev_col   # last column restore
+        self.fixed.pop()    # remove last incorrectly placed queen
+        self.unplace(prev_col, prev_row)
+        self.domains[prev_col] = prev_domain   # restore domain
+        return prev_col, prev_row
+
+    def update_initial(self, col, row):
+        ''' Change the preferred (1-based) row of one column without starting
+            over; same reasoning as CSPSolver.update_initial. Rows are picked
+            from the masks by next_row(), so only the rewind to col is needed. '''
+        self.initial[col] = row - 1
+        if not self.valid or len(self.stack) <= col:
+            return
+        while len(self.stack) > col + 1:
+            self.backtrack()
+        _, placed = self.backtrack()
+        self.domains[col] |= 1 << placed     # back into the domain
+        self.finished = False
+
+    def state(self):
+        return self.fixed[:]
+
+    def step(self):
+        ''' Step one time in solution '''
+        event = self.advance()
+        return event, event_payload(self, event)
+
+    def solve(self, max_nodes=None):
+        ''' Run to the end without step() events; returns result, state, nodes and time '''
+        return run_to_end(self, max_nodes)
+
+    def events(self):
+        ''' Lazy generator of step() events '''
+        return iter_events(self)
+
+    def advance(self):
+        ''' One step of the search, returning only the event name '''
+        if self.start_time is None: self.start_time = time.time()   # start timer
+        self.nodes += 1
+
+        # return solution
+        if self.finished:
+            return 'solution'
+
+        # all columns completed
+        if self.col >= self.n:
+            self.finished = True
+            return 'solution'
+
+        # Check if we are stuck (domain empty) -> Backtrack
+        if not self.domains[self.col]:
+            # if no previous state available, return invalid
+            if not self.stack:
+                self.valid = False
+                self.last = (self.col, None)
+                return 'invalid'
+
+            # backtracking now
+            self.last = self.backtrack()
+            return 'backtracking'
+
+        # Try next available row in domain (first tried user's row)
+        r = self.next_row(self.domains[self.col])
+        self.domains[self.col] &= ~(1 << r)
+
+        # Check forward consistency
+        if self.forward_check(self.col, r):
+            # Valid move
+            self.stack.append((self.col, self.domains[self.col], r))  # add state to stack
+            self.fixed.append(r)    # add to fixed queens
+            self.place(self.col, r)
+            self.last = (self.col, r)
             self.col += 1
-            return 'fixed', {'col': self.col - 1, 'state': self.fixed[:], 'row': r}
+            return 'fixed'
         else:
             # Invalid move (causes future conflict)
-            return 'searching', {'col': self.col, 'row': r}
\ No newline at end of file
+            self.last = (self.col, r)
+            return 'searching'
+
+
+
+# ==========================================
+# 4. SOLUTION ENUMERATION
+# ==========================================
+def iter_solutions(n, initial=None):
+    ''' Lazily yield every solution as a tuple of 0-based rows (one per column).
+        initial takes 1-based rows like set_initial; each column then tries the
+        user's row first, so the first solution yielded is the one CSPSolver finds. '''
+    preferred = [r - 1 for r in initial] if initial is not None else [-1] * n
+    return _iter_from(n, (), preferred)
+
+
+def count_solutions(n, symmetry=True):
+    ''' Number of solutions of the n-queens puzzle. With symmetry only the
+        canonical first-column placements are searched and weighted by 2. '''
+    if not symmetry:
+        return _count_from(n, ())
+    return sum(weight * _count_from(n, prefix) for prefix, weight in symmetric_prefixes(n))
+
+
+def symmetric_prefixes(n):
+    ''' Canonical starting placements as [(prefix rows, weight), ...].
+        Mirroring top to bottom pairs every solution with one whose first queen
+        is in the other half of column 0, so only the top half is searched.
+        For odd n the middle row of column 0 is its own mirror, so there the
+        second column is restricted to the top half instead. '''
+    if n == 1:
+        return [((0,), 1)]
+    mid = n // 2
+    prefixes = [((r,), 2) for r in range(mid)]
+    if n % 2:
+        prefixes += [((mid, r), 2) for r in range(mid) if abs(r - mid) > 1]
+    return prefixes
+
+
+def iter_unique_solutions(n):
+    ''' Lazily yield each solution up to rotation and reflection once, in canonical form '''
+    for prefix, weight in symmetric_prefixes(n):
+        for s in _iter_from(n, prefix, [-1] * n):
+            if s == canonical(s):
+                yield s
+
+
+def symmetries(rows):
+    ''' All distinct boards reachable from a 0-based board by rotation or reflection.
+        A board with two queens in one row has no rotated form with one queen per
+        column, so only the mirror images and the half turn apply to it. '''
+    n = len(rows)
+    rows = tuple(rows)
+    flipped = tuple(n - 1 - r for r in rows)   # top <-> bottom
+    boards = {rows, rows[::-1], flipped, flipped[::-1]}
+    if sorted(rows) == list(range(n)):
+        # transposing (swapping rows and columns) generates the quarter turns and diagonal mirrors
+        transposed = [0] * n
+        for c, r in enumerate(rows):
+            transposed[r] = c
+        transposed = tuple(transposed)
+        t_flipped = tuple(n - 1 - r for r in transposed)
+        boards |= {transposed, transposed[::-1], t_flipped, t_flipped[::-1]}
+    return boards
+
+
+def canonical(rows):
+    ''' Canonical form of a 0-based board (e.g. solver.initial or a solution):
+        the lexicographically smallest of its symmetric boards '''
+    return min(symmetries(rows))
+
+
+def _prefix_masks(n, prefix):
+    ''' Occupancy masks (rows, down-diagonals, up-diagonals) as seen from column
+        len(prefix), or None if the prefix queens attack each other. Same bit
+        layout as BitboardCSPSolver, but diagonals are shifted one column at a time. '''
+    rows = ld = rd = 0
+    for r in prefix:
+        bit = 1 << r
+        if (rows | ld | rd) & bit:
+            return None
+        rows |= bit
+        ld = (ld | bit) << 1
+        rd = (rd | bit) >> 1
+    return rows, ld, rd
+
+
+def _iter_from(n, prefix, preferred):
+    ''' Yield all solutions that start with the given 0-based prefix rows '''
+    masks = _prefix_masks(n, prefix)
+    if masks is None:
+        return
+    depth = len(prefix)
+    if depth == n:
+        yield tuple(prefix)
+        return
+
+    full = (1 << n) - 1
+    board = list(prefix) + [0] * (n - depth)
+    # per column: rows still to try and the occupancy masks it was entered with
+    avail, rows, ld, rd = [0] * n, [0] * n, [0] * n, [0] * n
+    c = depth
+    rows[c], ld[c], rd[c] = masks
+    avail[c] = full & ~(rows[c] | ld[c] | rd[c])
+    while c >= depth:
+        a = avail[c]
+        # column exhausted -> backtrack
+        if not a:
+            c -= 1
+            continue
+        # user's preferred row first, then lowest row
+        p = preferred[c]
+        bit = 1 << p if 0 <= p < n and a >> p & 1 else a & -a
+        avail[c] = a ^ bit
+        board[c] = bit.bit_length() - 1
+        if c == n - 1:
+            yield tuple(board)
+            continue
+        # move to next column
+        nr, nl, nd = rows[c] | bit, (ld[c] | bit) << 1, (rd[c] | bit) >> 1
+        c += 1
+        rows[c], ld[c], rd[c] = nr, nl, nd
+        avail[c] = full & ~(nr | nl | nd)
+
+
+def _count_from(n, prefix):
+    ''' Count all solutions that start with the given 0-based prefix rows '''
+    masks = _prefix_masks(n, prefix)
+    if masks is None:
+        return 0
+    left = n - len(prefix)
+    if left == 0:
+        return 1
+    full = (1 << n) - 1
+
+    def count(rows, ld, rd, left):
+        a = full & ~(rows | ld | rd)
+        total = 0
+        # two columns left: only check whether the last column still has a row
+        if left == 2:
+            while a:
+                bit = a & -a
+                a ^= bit
+                if full & ~(rows | bit | (ld | bit) << 1 | (rd | bit) >> 1):
+                    total += 1
+            return total
+        if left == 1:
+            return bin(a).count('1')
+        left -= 1
+        while a:
+            bit = a & -a
+            a ^= bit
+            total += count(rows | bit, (ld | bit) << 1, (rd | bit) >> 1, left)
+        return total
+
+    return count(*masks, left)
+
+
+
+# ==========================================
+# 5. MIN-CONFLICTS SOLVER
+# ==========================================
+class MinConflictsSolver:
+    ''' Local search for very large boards. Columns are first placed greedily,
+        starting from the user's rows, then queens in conflict are moved to the
+        row with the fewest conflicts until none are left. Rows and diagonals
+        keep queen counts in arrays, so every move updates in O(1). '''
+    SCAN_LIMIT = 64     # boards up to this size check every row, larger ones sample
+    SAMPLES = 32        # rows sampled per move on large boards
+    NOISE = 0.2         # chance of a random row when the best move does not help (escapes local minima)
+
+    def __init__(self, n=8, seed=None, max_moves=None):
+        self.n = n
+        self.seed = seed
+        self.max_moves = max_moves if max_moves is not None else 100 * n + 1000    # give up after this
+        self.reset()
+
+    def reset(self):
+        n = self.n
+        self.start_time = None
+        self.nodes = 0
+        self.initial = [0] * n
+        self.fixed = array('l')     # row of the queen in each placed column
+        self.col = 0    # columns placed so far (== n once repairing)
+        self.valid = True
+        self.finished = False
+        self.moves = 0
+        self.rng = random.Random(self.seed)
+        self.last = (0, None)   # (col, row) of the last step, for event payloads
+        self.exact = True   # False once update_initial may have led away from a fresh solve's result
+        # queens on each row / diagonal (r - c + n - 1) / anti-diagonal (r + c)
+        self.row_count = array('l', [0]) * n
+        self.diag_count = array('l', [0]) * (2 * n - 1)
+        self.anti_count = array('l', [0]) * (2 * n - 1)
+        # sum of the columns of those queens: with two queens on a line, the other one is sum - col
+        self.row_sum = array('q', [0]) * n
+        self.diag_sum = array('q', [0]) * (2 * n - 1)
+        self.anti_sum = array('q', [0]) * (2 * n - 1)
+        self.pairs = 0  # number of attacking pairs on the board
+        # rows holding no queen, with each row's position in that list (-1 if taken)
+        self.free = array('l', range(n))
+        self.free_pos = array('l', range(n))
+        # columns that may be in conflict, checked when picked. Queens put into
+        # conflict on a line holding 3+ queens are found when the list is rescanned.
+        self.conflicted = []
+
+    def set_initial(self, rows):
+        # 1. Reset first to clear old state
+        self.reset()
+
+        # 2. Apply User Input (1-based -> 0-based); used as the first choice for each column
+        self.initial = [r - 1 for r in rows[:]]
+
+    def update_initial(self, col, row):
+        ''' Change the preferred (1-based) row of one column. A column not yet
+            placed just picks it up later (nothing differs from a fresh solve);
+            a placed queen is moved there and the conflicts it causes are
+            repaired locally, which need not end where a fresh solve would,
+            so exact is cleared. '''
+        self.initial[col] = row - 1
+        if col >= self.col:
+            return
+        self.exact = False
+        old = self.fixed[col]
+        self.remove(col, old)
+        self.add(col, row - 1)
+        self.fixed[col] = row - 1
+        if self.pairs:
+            # repair again, with a fresh move budget
+            self.finished = False
+            self.valid = True
+            self.moves = 0
+
+    def conflicts(self, col, row):
+        ''' Number of placed queens attacking (col, row) '''
+        return self.row_count[row] + self.diag_count[row - col + self.n - 1] + self.anti_count[row + col]
+
+    def add(self, col, row):
+        ''' Put a queen on (col, row) and update counters '''
+        n = self.n
+        d, a = row - col + n - 1, row + col
+        k = self.conflicts(col, row)
+        self.pairs += k
+        if not self.row_count[row]:
+            # row no longer free: move the last free row into its slot
+            i = self.free_pos[row]
+            last = self.free.pop()
+            if last != row:
+                self.free[i] = last
+                self.free_pos[last] = i
+            self.free_pos[row] = -1
+        self.row_count[row] += 1
+        self.diag_count[d] += 1
+        self.anti_count[a] += 1
+        self.row_sum[row] += col
+        self.diag_sum[d] += col
+        self.anti_sum[a] += col
+        if k:
+            # remember this queen and any partner we can name for pick_conflicted
+            conflicted = self.conflicted
+            conflicted.append(col)
+            if self.row_count[row] == 2:
+                conflicted.append(self.row_sum[row] - col)
+            if self.diag_count[d] == 2:
+                conflicted.append(self.diag_sum[d] - col)
+            if self.anti_count[a] == 2:
+                conflicted.append(self.anti_sum[a] - col)
+
+    def remove(self, col, row):
+        ''' Take the queen off (col, row) and update counters '''
+        n = self.n
+        d, a = row - col + n - 1, row + col
+        self.row_count[row] -= 1
+        self.diag_count[d] -= 1
+        self.anti_count[a] -= 1
+        self.row_sum[row] -= col
+        self.diag_sum[d] -= col
+        self.anti_sum[a] -= col
+        self.pairs -= self.conflicts(col, row)
+        if not self.row_count[row]:
+            self.free_pos[row] = len(self.free)
+            self.free.append(row)
+
+    def choose_row(self, col, preferred=-1):
+        ''' Row with the fewest conflicts for a queen about to go into col
+            (preferred row first if it is free of conflicts, ties broken at random) '''
+        n = self.n
+        if 0 <= preferred < n and not self.conflicts(col, preferred):
+            return preferred
+        if n > self.SCAN_LIMIT:
+            return self.sample_row(col)
+        best, best_rows = None, []
+        for r in range(n):
+            k = self.conflicts(col, r)
+            if best is None or k < best:
+                best, best_rows = k, [r]
+            elif k == best:
+                best_rows.append(r)
+        return best_rows[0] if len(best_rows) == 1 else self.rng.choice(best_rows)
+
+    def sample_row(self, col):
+        ''' choose_row for large boards: try random rows, mostly empty ones,
+            and stop at the first without conflicts '''
+        n = self.n
+        free, rand = self.free, self.rng.random
+        row_count, diag_count, anti_count = self.row_count, self.diag_count, self.anti_count
+        best, best_row = None, -1
+        for i in range(self.SAMPLES):
+            # empty rows are the likely winners; every 4th try any row, in case they are all attacked
+            if free and i % 4:
+                r = free[int(rand() * len(free))]
+            else:
+                r = int(rand() * n)
+            k = row_count[r] + diag_count[r - col + n - 1] + anti_count[r + col]
+            if not k:
+                return r
+            if best is None or k < best:
+                best, best_row = k, r
+        return best_row
+
+    def queen_conflicts(self, col):
+        ''' Number of other queens attacking the queen in col '''
+        return self.conflicts(col, self.fixed[col]) - 3
+
+    def pick_conflicted(self):
+        ''' A random column whose queen is attacked (needs self.pairs > 0) '''
+        conflicted, rng = self.conflicted, self.rng
+        while True:
+            if not conflicted:
+                # list ran dry while pairs remain: rescan the board once
+                conflicted.extend(c for c in range(self.n) if self.queen_conflicts(c))
+            i = rng.randrange(len(conflicted))
+            c = conflicted[i]
+            conflicted[i] = conflicted[-1]
+            conflicted.pop()
+            if self.queen_conflicts(c):
+                return c
+
+    def place_next(self):
+        ''' Initial greedy placement of column self.col '''
+        c = self.col
+        r = self.choose_row(c, self.initial[c])
+        self.add(c, r)
+        self.fixed.append(r)
+        self.col += 1
+        return c, r
+
+    def place_rest(self, stop):
+        ''' place_next() for columns self.col .. stop-1 in one loop. Same choices
+            as place_next/add, with everything held in locals for the large-N hot path. '''
+        n, col = self.n, self.col
+        if n <= self.SCAN_LIMIT:
+            while self.col < stop:
+                self.place_next()
+            return
+        initial, fixed = self.initial, self.fixed
+        row_count, diag_count, anti_count = self.row_count, self.diag_count, self.anti_count
+        row_sum, diag_sum, anti_sum = self.row_sum, self.diag_sum, self.anti_sum
+        free, free_pos, conflicted = self.free, self.free_pos, self.conflicted
+        rand, samples = self.rng.random, self.SAMPLES
+        pairs = self.pairs
+        for col in range(col, stop):
+            # choose_row: preferred row if it is free of conflicts, else sample_row
+            r = initial[col]
+            if not (0 <= r < n) or row_count[r] + diag_count[r - col + n - 1] + anti_count[r + col]:
+                best = None
+                for i in range(samples):
+                    if free and i % 4:
+                        s = free[int(rand() * len(free))]
+                    else:
+                        s = int(rand() * n)
+                    k = row_count[s] + diag_count[s - col + n - 1] + anti_count[s + col]
+                    if best is None or k < best:
+                        best, r = k, s
+                        if not k:
+                            break
+            # add()
+            d, a = r - col + n - 1, r + col
+            k = row_count[r] + diag_count[d] + anti_count[a]
+            pairs += k
+            if not row_count[r]:
+                i = free_pos[r]
+                last = free.pop()
+                if last != r:
+                    free[i] = last
+                    free_pos[last] = i
+                free_pos[r] = -1
+            row_count[r] += 1
+            diag_count[d] += 1
+            anti_count[a] += 1
+            row_sum[r] += col
+            diag_sum[d] += col
+            anti_sum[a] += col
+            if k:
+                conflicted.append(col)
+                if row_count[r] == 2:
+                    conflicted.append(row_sum[r] - col)
+                if diag_count[d] == 2:
+                    conflicted.append(diag_sum[d] - col)
+                if anti_count[a] == 2:
+                    conflicted.append(anti_sum[a] - col)
+            fixed.append(r)
+        self.pairs = pairs
+        self.col = stop
+
+    def repair(self):
+        ''' Move one attacked queen to its least conflicted row '''
+        c = self.pick_conflicted()
+        old = self.fixed[c]
+        self.remove(c, old)
+        r = self.choose_row(c)
+        if self.conflicts(c, r) >= self.conflicts(c, old) and self.rng.random() < self.NOISE:
+            r = self.rng.randrange(self.n)
+        self.add(c, r)
+        self.fixed[c] = r
+        self.moves += 1
+        return c, r
+
+    def state(self):
+        return self.fixed[:]
+
+    def step(self):
+        event = self.advance()
+        return event, event_payload(self, event)
+
+    def events(self):
+        ''' Lazy generator of step() events '''
+        return iter_events(self)
+
+    def advance(self):
+        ''' One step of the search, returning only the event name '''
+        if self.start_time is None: self.start_time = time.time()   # start timer
+        self.nodes += 1
+
+        # check for invalid configuration or finished message
+        if not self.valid or self.finished:
+            return 'done'
+
+        # first pass: place one column at a time
+        if self.col < self.n:
+            self.last = self.place_next()
+            return 'fixed'
+
+        # no attacking pairs left -> solution
+        if not self.pairs:
+            self.finished = True
+            return 'solution'
+
+        # out of moves (also how boards without a solution, e.g. n = 2 or 3, end)
+        if self.moves >= self.max_moves:
+            self.valid = False
+            self.last = (self.col, None)
+            return 'invalid'
+
+        self.last = self.repair()
+        return 'fixed'
+
+    def solve(self, max_nodes=None):
+        ''' Run to the end without building step() events. The first pass is
+            done in one place_rest() call; nodes are counted as with step(). '''
+        if self.start_time is None: self.start_time = time.time()   # start timer
+        if self.valid and not self.finished and self.col < self.n:
+            stop = self.n
+            if max_nodes is not None:
+                stop = max(self.col, min(stop, self.col + max_nodes - self.nodes))
+            self.nodes += stop - self.col
+            self.place_rest(stop)
+        result = run_to_end(self, max_nodes)
+        result['moves'] = self.moves
+        return result
+
+
+
+# ==========================================
+# 6. DANCING LINKS (ALGORITHM X) SOLVER
+# ==========================================
+class DLXSolver:
+    ''' N-queens as exact cover, solved with Knuth's Dancing Links.
+        Primary items: every column and every row (each covered exactly once);
+        secondary items: the diagonals (covered at most once). Option (c, r) is
+        the 4 nodes {column c, row r, diagonal, anti-diagonal}. The links are
+        flat int lists (L/R/U/D, item of each node, item sizes; L/R of a node
+        link it to the rest of its option), so cover and uncover are O(1) per
+        node with no node objects, and a node's (col, row) follows from its
+        index (see place).
+
+        variable 'static' covers columns left to right (rows of a column in
+        set_initial's order, user's row first), which gives the same kind of
+        column-by-column step() events as CSPSolver; 'mrv' picks Knuth's
+        smallest item, row or column. A placement that leaves an uncovered
+        primary item with no options is undone at once ('searching'), like a
+        failed forward check. With all_solutions the search goes on after each
+        'solution' until 'done'; solutions counts them. '''
+    VARIABLE_ORDERS = ('static', 'mrv')
+
+    def __init__(self, n=8, variable='static', all_solutions=False):
+        if variable not in self.VARIABLE_ORDERS:
+            raise ValueError(f"variable must be one of {self.VARIABLE_ORDERS}, not {variable!r}")
+        self.n = n
+        self.variable = variable
+        self.all_solutions = all_solutions
+        self.reset()    # reset board
+
+    def reset(self):
+        self.start_time = None
+        self.nodes = 0
+        self.initial = [0] * self.n  # Default (initial)
+        self.fixed = []
+        self.col = 0
+        self.valid = True
+        self.finished = False
+        self.solutions = 0  # solutions found so far
+        self.stack = []  # (item, chosen node) per placed queen
+        self.item = None    # item covered at the current level (None: choose one next)
+        self.pending = None     # next node of self.item to try
+        self.resume = False     # all_solutions: undo the last queen before going on
+        self.last = (0, None)   # (col, row) of the last step, for event payloads
+        self.L = None   # links, built on first use (see build)
+
+    def set_initial(self, rows):
+        # 1. Reset first to clear state (stack, fixed, etc.)
+        self.reset()
+
+        # 2. Apply User Input AFTER reset, so it doesn't get overwritten
+        self.initial = [r - 1 for r in rows[:]]
+
+        # 3. Rebuild the links so every column lists the user's row first
+        self.build()
+
+    def build(self):
+        ''' Items: 0 root, 1..n columns, n+1..2n rows (primary, linked in that
+            order to the root), then 2n-1 diagonals and 2n-1 anti-diagonals
+            (secondary, linked only to themselves). Nodes follow from self.first,
+        4 per option, columns in order and each column's rows in row_order. '''
+        n = self.n
+        primary = 2 * n
+        items = primary + 2 * (2 * n - 1)
+        self.primary = primary
+        self.L = [i - 1 for i in range(items + 1)]
+        self.R = [i + 1 for i in range(items + 1)]
+        self.L[0], self.R[primary] = primary, 0
+        for i in range(primary + 1, items + 1):
+            self.L[i] = self.R[i] = i
+        self.U = list(range(items + 1))
+        self.D = list(range(items + 1))
+        self.C = list(range(items + 1))     # item of each node (items point to themselves)
+        self.S = [0] * (items + 1)  # options per item
+        self.first = items + 1  # first option node
+        self.zero = 0   # uncovered primary items without options (dead end if > 0)
+
+        diag = primary + 1
+        anti = diag + 2 * n - 1
+        L, R, C, U, D, S = self.L, self.R, self.C, self.U, self.D, self.S
+        for c in range(n):
+            for r in self.row_order(c):
+                base = len(C)
+                for k, item in enumerate((1 + c, n + 1 + r, diag + r - c + n - 1, anti + r + c)):
+                    node = base + k
+                    L.append(base + (k - 1) % 4)    # circular within the option
+                    R.append(base + (k + 1) % 4)
+                    C.append(item)
+                    U.append(U[item])
+                    D.append(item)
+                    D[U[item]] = node
+                    U[item] = node
+                    S[item] += 1
+
+    def row_order(self, c):
+        ''' Rows of column c in the order its options are linked: user's row first '''
+        preferred = self.initial[c]
+        if 0 <= preferred < self.n:
+            return [preferred] + [r for r in range(self.n) if r != preferred]
+        return range(self.n)
+
+    def place(self, node):
+        ''' (col, row) of an option node, from its index '''
+        c, j = divmod((node - self.first) >> 2, self.n)
+        preferred = self.initial[c]
+        if 0 <= preferred < self.n:
+            # j-th row of [preferred, 0, 1, ... without preferred]
+            return c, preferred if j == 0 else (j - 1 if j <= preferred else j)
+        return c, j
+
+    def cover(self, i):
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        primary = self.primary
+        L[R[i]] = L[i]
+        R[L[i]] = R[i]
+        if i <= primary and not S[i]:
+            self.zero -= 1
+        p = D[i]
+        while p != i:
+            q = R[p]
+            while q != p:   # hide the option from its other items
+                u, d = U[q], D[q]
+                D[u] = d
+                U[d] = u
+                x = C[q]
+                S[x] -= 1
+                if not S[x] and x <= primary:
+                    self.zero += 1
+                q = R[q]
+            p = D[p]
+
+    def uncover(self, i):
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        primary = self.primary
+        p = U[i]
+        while p != i:
+            q = L[p]
+            while q != p:
+                x = C[q]
+                if not S[x] and x <= primary:
+                    self.zero -= 1
+                S[x] += 1
+                D[U[q]] = q
+                U[D[q]] = q
+                q = L[q]
+            p = U[p]
+        if i <= primary and not S[i]:
+            self.zero += 1
+        L[R[i]] = i
+        R[L[i]] = i
+
+    def choose(self):
+        ''' Next primary item to cover, or None if every one is covered '''
+        R = self.R
+        first = R[0]
+        if first == 0:
+            return None
+        if self.variable == 'static':
+            return first
+        best, size, i = first, self.S[first], R[first]
+        while i != 0 and size > 1:
+            if self.S[i] < size:
+                best, size = i, self.S[i]
+            i = R[i]
+        return best
+
+    def board(self):
+        ''' Row per column, None where no queen is placed yet '''
+        rows = [None] * self.n
+        for _, node in self.stack:
+            c, r = self.place(node)
+            rows[c] = r
+        return rows
+
+    def state(self):
+        return self.fixed[:] if self.variable == 'static' else self.board()
+
+    def step(self):
+        ''' Step one time in solution '''
+        event = self.advance()
+        return event, event_payload(self, event)
+
+    def solve(self, max_nodes=None):
+        ''' Run to the end without step() events; returns result, state, nodes
+            and time, plus the number of solutions. In all_solutions mode the
+            result is 'done' once the search is exhausted. '''
+        if not self.all_solutions:
+            out = run_to_end(self, max_nodes)
+        else:
+            if self.start_time is None: self.start_time = time.time()   # start timer
+            advance = self.advance
+            result = None
+            while result not in ('done', 'invalid'):
+                if max_nodes is not None and self.nodes >= max_nodes:
+                    result = 'limit'
+                    break
+                result = advance()
+            out = {'result': result, 'state': self.state(), 'nodes': self.nodes,
+                   'time': time.time() - self.start_time}
+        out['solutions'] = self.solutions
+        return out
+
+    def events(self):
+        ''' Lazy generator of step() events (in all_solutions mode up to 'done') '''
+        if not self.all_solutions:
+            return iter_events(self)
+        return self._all_events()
+
+    def _all_events(self):
+        while True:
+            event = self.advance()
+            yield event, event_payload(self, event)
+            if event in ('done', 'invalid'):
+                return
+
+    def others(self, node):
+        ''' The other 3 nodes of node's option, in cover order '''
+        R = self.R
+        return [R[node], R[R[node]], R[R[R[node]]]]
+
+    def backtrack(self):
+        ''' Undo the last placement and queue the next option of its item '''
+        item, node = self.stack.pop()
+        for q in reversed(self.others(node)):
+            self.uncover(self.C[q])
+        self.fixed.pop()
+        self.item = item
+        self.pending = self.D[node]
+        self.last = self.place(node)
+        self.col = self.last[0]
+        return 'backtracking'
+
+    def advance(self):
+        ''' One step of the search, returning only the event name '''
+        if self.start_time is None: self.start_time = time.time()   # start timer
+        self.nodes += 1
+        if self.L is None:
+            self.build()
+
+        # search over (or first solution already reported)
+        if not self.valid or (self.finished and self.all_solutions):
+            return 'done'
+        if self.finished:
+            return 'solution'
+
+        if self.item is None:
+            if self.resume:
+                # all_solutions: carry on from the solution just reported
+                self.resume = False
+                return self.backtrack()
+            i = self.choose()
+            # every row and column covered -> solution
+            if i is None:
+                self.solutions += 1
+                self.col = self.n
+                if self.all_solutions:
+                    self.resume = True
+                else:
+                    self.finished = True
+                return 'solution'
+            self.cover(i)
+            self.item = i
+            self.pending = self.D[i]
+            if self.variable == 'static':
+                self.col = i - 1
+
+        x = self.pending
+        i = self.item
+        # options of this item used up -> backtrack
+        if x == i:
+            self.uncover(i)
+            if not self.stack:
+                self.item = None
+                self.valid = not self.solutions     # exhausted: 'invalid' only if nothing was found
+                self.finished = bool(self.solutions)
+                self.last = (self.col, None)
+                return 'done' if self.solutions else 'invalid'
+            return self.backtrack()
+
+        # try option x: cover its other items
+        c, r = self.place(x)
+        self.last = (c, r)
+        others = self.others(x)
+        for q in others:
+            self.cover(self.C[q])
+        if self.zero:
+            # some row or column can no longer be covered: undo
+            for q in reversed(others):
+                self.uncover(self.C[q])
+            self.pending = self.D[x]
+            return 'searching'
+
+        # Valid move
+        self.stack.append((i, x))
+        self.fixed.append(r)
+        self.item = None
+        self.col = c + 1 if self.variable == 'static' else c
+        return 'fixed'
+
+
+# ==========================================
+# SOLVER REGISTRY
+# ==========================================
+# name -> factory taking n, for headless tools (benchmark, batch runs)
+SOLVERS = {
+    'bfs': BFSSolver,
+    'csp': CSPSolver,
+    'csp-trail': lambda n: CSPSolver(n, trail=True),
+    'csp-mrv': lambda n: CSPSolver(n, trail=True, variable='mrv', value='lcv'),
+    'bitboard': BitboardCSPSolver,
+    'min-conflicts': lambda n: MinConflictsSolver(n, seed=0),
+    'dlx': DLXSolver,
+}
@@ -1,6 +1,7 @@
+import sys
 from board import QueensApp
 
-BOARD_SIZE = 8
+BOARD_SIZE = int(sys.argv[1]) if len(sys.argv) > 1 else 8     # e.g. python app.py 30
 CELL_SIZE = 60
 
 if __name__ == '__main__':
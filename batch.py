@@ -0,0 +1,144 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from collections import deque
+from itertools import islice
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from algorithms import SOLVERS
+
+# ==========================================
+# HEADLESS BATCH SOLVER
+# ==========================================
+def read_jsonl(lines):
+    ''' (id, rows) per line: either a plain list of rows or {"rows": [...], "id": ...} '''
+    for i, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError as e:
+            yield i, None, f"bad JSON: {e}"
+            continue
+        if isinstance(item, dict):
+            yield item.get('id', i), item.get('rows'), None
+        else:
+            yield i, item, None
+
+
+def read_csv(lines):
+    ''' (id, rows) per line of comma separated rows; a non-numeric first line is taken as a header '''
+    for i, record in enumerate(csv.reader(lines), 1):
+        if not record:
+            continue
+        try:
+            yield i, [int(v) for v in record], None
+        except ValueError:
+            if i > 1:
+                yield i, None, f"bad CSV row: {record}"
+
+
+def solve_one(job):
+    ''' Worker: solve one configuration and return the output record '''
+    key, rows, error, solver_name, max_nodes = job
+    record = {'id': key, 'initial': rows}
+    if error is None:
+        error = check_rows(rows)
+    if error is not None:
+        record.update(result='error', valid=False, error=error)
+        return record
+    solver = SOLVERS[solver_name](len(rows))
+    solver.set_initial(rows)
+    out = solver.solve(max_nodes)
+    solution = [r + 1 for r in out['state']] if out['result'] == 'solution' else None
+    record.update(result=out['result'], valid=out['result'] == 'solution', solution=solution,
+                  nodes=out['nodes'], time=out['time'])
+    return record
+
+
+def check_rows(rows):
+    ''' Error message for rows that set_initial cannot take, else None '''
+    if not isinstance(rows, list) or not rows:
+        return 'rows must be a non-empty list'
+    if not all(isinstance(r, int) and 1 <= r <= len(rows) for r in rows):
+        return f"rows must be integers from 1 to {len(rows)}"
+    return None
+
+
+def solve_chunk(jobs):
+    ''' Worker: solve a list of jobs (one pool task per chunk keeps IPC overhead low) '''
+    return [solve_one(job) for job in jobs]
+
+
+def run_serial(jobs):
+    for job in jobs:
+        yield solve_one(job)
+
+
+def run_pool(jobs, workers, ordered=True, chunk_size=64, window=None):
+    ''' Solve jobs on a process pool, chunk_size jobs per task, with at most
+        `window` tasks in flight, so the input is never read far ahead of the output '''
+    window = window or 4 * workers
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        while True:
+            chunk = list(islice(jobs, chunk_size))
+            if not chunk:
+                break
+            pending.append(pool.submit(solve_chunk, chunk))
+            while len(pending) >= window:
+                yield from _drain(pending, ordered)
+        while pending:
+            yield from _drain(pending, ordered)
+
+
+def _drain(pending, ordered):
+    ''' Results of finished tasks: the oldest one (ordered) or whichever are done '''
+    if ordered:
+        yield from pending.popleft().result()
+        return
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    for future in done:
+        pending.remove(future)
+        yield from future.result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Solve initial configurations (1-based rows, as in the app) from a file or stdin '
+                    'and stream one JSON result per line.')
+    parser.add_argument('input', nargs='?', default='-', help="JSONL or CSV file, '-' for stdin")
+    parser.add_argument('--format', choices=('auto', 'jsonl', 'csv'), default='auto',
+                        help='input format (auto: by file extension, JSONL for stdin)')
+    parser.add_argument('--solver', choices=list(SOLVERS), default='bitboard')
+    parser.add_argument('--max-nodes', type=int, default=None, help="give up after this many nodes (result 'limit')")
+    parser.add_argument('--workers', type=int, default=1, help='processes to solve on (0 = one per CPU)')
+    parser.add_argument('--chunk-size', type=int, default=64, help='configurations per pool task')
+    parser.add_argument('--unordered', action='store_true', help='print results as they finish, not in input order')
+    args = parser.parse_args(argv)
+
+    fmt = args.format
+    if fmt == 'auto':
+        fmt = 'csv' if args.input.lower().endswith('.csv') else 'jsonl'
+    source = sys.stdin if args.input == '-' else open(args.input, newline='')
+    try:
+        reader = read_csv(source) if fmt == 'csv' else read_jsonl(source)
+        jobs = ((key, rows, error, args.solver, args.max_nodes) for key, rows, error in reader)
+        workers = args.workers or os.cpu_count()
+        if workers == 1:
+            results = run_serial(jobs)
+        else:
+            results = run_pool(jobs, workers, not args.unordered, args.chunk_size)
+        for record in results:
+            sys.stdout.write(json.dumps(record) + '\n')
+            sys.stdout.flush()
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,214 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from algorithms import DEFAULT_INITIAL, SOLVERS, CSPSolver, DLXSolver, count_solutions
+
+# ==========================================
+# BENCHMARK HARNESS
+# ==========================================
+CONFIGS = ('default', 'random', 'same-row', 'diagonal')
+
+
+def configurations(n, kinds, samples=3, seed=0):
+    ''' (kind, 1-based rows) pairs for one board size.
+        default  - the app's default configuration (n = 8 only)
+        random   - `samples` seeded random configurations
+        same-row - every queen prefers row 1, so almost every preference conflicts
+        diagonal - every queen prefers the main diagonal '''
+    rng = random.Random(f"{seed}-{n}")
+    for kind in kinds:
+        if kind == 'default':
+            if n == len(DEFAULT_INITIAL):
+                yield kind, list(DEFAULT_INITIAL)
+        elif kind == 'random':
+            for _ in range(samples):
+                yield kind, [rng.randint(1, n) for _ in range(n)]
+        elif kind == 'same-row':
+            yield kind, [1] * n
+        elif kind == 'diagonal':
+            yield kind, list(range(1, n + 1))
+        else:
+            raise ValueError(f"unknown configuration {kind!r}")
+
+
+def run_solver(factory, n, rows, max_nodes):
+    ''' Run a fresh solver until it stops or hits max_nodes; returns (result, solver) '''
+    solver = factory(n)
+    solver.set_initial(rows)
+    return solver.solve(max_nodes)['result'], solver
+
+
+def measure(name, n, kind, rows, max_nodes, memory=True, repeat=1):
+    ''' One benchmark record, timed as the fastest of `repeat` runs. Peak memory
+        comes from an extra, traced run so tracemalloc does not distort the timing. '''
+    factory = SOLVERS[name]
+    elapsed = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result, solver = run_solver(factory, n, rows, max_nodes)
+        elapsed = min(elapsed, time.perf_counter() - start)
+    peak = None
+    if memory:
+        tracemalloc.start()
+        run_solver(factory, n, rows, max_nodes)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return {
+        'solver': name, 'n': n, 'config': kind, 'initial': rows,
+        'result': result, 'success': result == 'solution',
+        'nodes': solver.nodes, 'time': elapsed,
+        'nodes_per_sec': solver.nodes / elapsed if elapsed > 0 else None,
+        'peak_memory': peak,
+    }
+
+
+def summarize(records):
+    ''' Aggregate records per (solver, n, config) '''
+    groups = {}
+    for rec in records:
+        groups.setdefault((rec['solver'], rec['n'], rec['config']), []).append(rec)
+    summary = []
+    for (name, n, kind), recs in groups.items():
+        total_time = sum(r['time'] for r in recs)
+        total_nodes = sum(r['nodes'] for r in recs)
+        peaks = [r['peak_memory'] for r in recs if r['peak_memory'] is not None]
+        summary.append({
+            'solver': name, 'n': n, 'config': kind, 'runs': len(recs),
+            'success_rate': sum(r['success'] for r in recs) / len(recs),
+            'mean_nodes': total_nodes / len(recs),
+            'mean_time': total_time / len(recs),
+            'nodes_per_sec': total_nodes / total_time if total_time > 0 else None,
+            'peak_memory': max(peaks) if peaks else None,
+        })
+    return summary
+
+
+def compare(summary, baseline, threshold=1.2):
+    ''' Lines describing changes against an earlier results file; slowdowns
+        beyond threshold (time ratio) are marked REGRESSION '''
+    old = {(s['solver'], s['n'], s['config']): s for s in baseline['summary']}
+    lines = []
+    for s in summary:
+        before = old.get((s['solver'], s['n'], s['config']))
+        if before is None or not before['mean_time']:
+            continue
+        ratio = s['mean_time'] / before['mean_time']
+        flag = '  REGRESSION' if ratio > threshold else ''
+        lines.append(f"{s['solver']:>14} n={s['n']:<4} {s['config']:<9} time x{ratio:.2f} "
+                     f"nodes {before['mean_nodes']:.0f} -> {s['mean_nodes']:.0f}{flag}")
+    return lines
+
+
+def csp_count(n):
+    ''' (solutions, nodes): every solution enumerated with CSPSolver.forward_check,
+        which copies the domain lists at each node '''
+    solver = CSPSolver(n)
+    solver.set_initial([1] * n)
+    nodes = 0
+
+    def search(col, domains):
+        nonlocal nodes
+        if col == n:
+            return 1
+        total = 0
+        for r in domains[col]:
+            nodes += 1
+            new_domains = solver.forward_check(col, r, domains)
+            if new_domains is not None:
+                total += search(col + 1, new_domains)
+        return total
+
+    return search(0, solver.domains), nodes
+
+
+def count_all(n):
+    ''' Enumeration workload: every solution of an n x n board, counted by the
+        DLX solver (all_solutions), by CSPSolver's forward checking and by the
+        bitmask enumerator. '''
+    records = []
+    solver = DLXSolver(n, all_solutions=True)
+    solver.set_initial([1] * n)
+    start = time.perf_counter()
+    out = solver.solve()
+    records.append({'engine': 'dlx', 'n': n, 'solutions': out['solutions'], 'nodes': out['nodes'],
+                    'time': time.perf_counter() - start})
+    start = time.perf_counter()
+    count, nodes = csp_count(n)
+    records.append({'engine': 'csp', 'n': n, 'solutions': count, 'nodes': nodes,
+                    'time': time.perf_counter() - start})
+    start = time.perf_counter()
+    count = count_solutions(n, symmetry=False)
+    records.append({'engine': 'bitmask', 'n': n, 'solutions': count, 'nodes': None,
+                    'time': time.perf_counter() - start})
+    return records
+
+
+def format_table(summary):
+    header = f"{'solver':>14} {'n':>4} {'config':<9} {'ok':>5} {'nodes':>10} {'time(s)':>9} {'nodes/s':>10} {'peak KiB':>9}"
+    lines = [header, '-' * len(header)]
+    for s in summary:
+        nps = f"{s['nodes_per_sec']:.0f}" if s['nodes_per_sec'] else '-'
+        mem = f"{s['peak_memory'] / 1024:.0f}" if s['peak_memory'] is not None else '-'
+        lines.append(f"{s['solver']:>14} {s['n']:>4} {s['config']:<9} {s['success_rate']:>5.0%} "
+                     f"{s['mean_nodes']:>10.0f} {s['mean_time']:>9.4f} {nps:>10} {mem:>9}")
+    return lines
+
+
+def write_results(path, args, **results):
+    meta = {'python': sys.version.split()[0], 'platform': platform.platform(),
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'), 'args': vars(args)}
+    with open(path, 'w') as f:
+        json.dump({'meta': meta, **results}, f, indent=1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark n-queens solvers headlessly.')
+    parser.add_argument('--solvers', nargs='+', default=list(SOLVERS), choices=list(SOLVERS))
+    parser.add_argument('--sizes', nargs='+', type=int, default=[8, 12, 16])
+    parser.add_argument('--configs', nargs='+', default=list(CONFIGS), choices=CONFIGS)
+    parser.add_argument('--samples', type=int, default=3, help='random configurations per size')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-nodes', type=int, default=200000, help='give up a run after this many nodes')
+    parser.add_argument('--repeat', type=int, default=1, help='time each case as the fastest of this many runs')
+    parser.add_argument('--no-memory', dest='memory', action='store_false', help='skip the traced memory run')
+    parser.add_argument('--out', help='write results as JSON to this file')
+    parser.add_argument('--compare', help='earlier JSON results to diff against')
+    parser.add_argument('--count', action='store_true', help='time counting all solutions instead (enumeration)')
+    args = parser.parse_args(argv)
+
+    if args.count:
+        records = []
+        for n in args.sizes:
+            for r in count_all(n):
+                nodes = r['nodes'] if r['nodes'] is not None else '-'
+                print(f"{r['engine']:>8} n={r['n']:<4} solutions {r['solutions']:>8} nodes {nodes:>9} time {r['time']:.3f}s")
+                records.append(r)
+        if args.out:
+            write_results(args.out, args, count=records)
+        return
+
+    records = []
+    for n in args.sizes:
+        cases = list(configurations(n, args.configs, args.samples, args.seed))
+        for name in args.solvers:
+            for kind, rows in cases:
+                records.append(measure(name, n, kind, rows, args.max_nodes, args.memory, args.repeat))
+    summary = summarize(records)
+    print('\n'.join(format_table(summary)))
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print()
+        print('\n'.join(compare(summary, baseline)))
+    if args.out:
+        write_results(args.out, args, results=records, summary=summary)
+
+
+if __name__ == '__main__':
+    main()
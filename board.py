@@ -1,7 +1,9 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import time
-from algorithms import BFSSolver, CSPSolver
+import threading
+import queue
+from algorithms import BFSSolver, CSPSolver, BitboardCSPSolver, DLXSolver, MinConflictsSolver, DEFAULT_INITIAL, STOP_EVENTS, event_payload
 
 BOARD_SIZE = 8
 CELL_SIZE = 60
@@ -17,6 +19,7 @@ class QueensApp(tk.Tk):
         self.resizable(False, False)
 
         self.n = n
+        self.cell = CELL_SIZE if n <= 8 else max(10, 8 * CELL_SIZE // n)    # keep big boards on screen
         self.solver = BFSSolver(n)
         
         # Animation settings
@@ -24,12 +27,33 @@ class QueensApp(tk.Tk):
         self.anim_speed = 15   
         self.anim_steps = 15   
         
-        self.default_initial_1based = [1, 5, 8, 6, 3, 7, 2, 4] 
+        # the classic default on 8x8, a knight's-move pattern on other sizes
+        self.default_initial_1based = list(DEFAULT_INITIAL) if n == 8 else [(2 * c) % n + 1 for c in range(n)]
+
+        # Fast-forward: while running, render once per `render_every` steps, at most `max_fps` frames/s
+        self.render_every = 50
+        self.max_fps = 30
+
+        # Turbo: the solver runs on a worker thread, the UI only draws its latest snapshot
+        self._turbo_thread = None
+        self._turbo_cancel = None   # threading.Event, set by on_reset
+        self._turbo_queue = None    # holds at most one (newest) snapshot
+        self._turbo_rate = None     # (time, nodes) of the previous frame, for nodes/sec
+
+        # Custom row edits: applied once typing pauses, re-solved in the background
+        self.edit_delay = 400   # ms
+        self._edit_job = None
+        self._resolving = None  # status note while an edit is being re-solved
 
         self.running = False
         self.is_animating = False
         self._run_job = None 
 
+        # Persistent canvas items, created in _draw_board and only updated afterwards
+        self.highlight_item = None
+        self.queen_items = []   # one queen per column (placed or ghost)
+        self.rendered = []  # what each queen item shows: (row, color) or None when hidden
+
         self._create_widgets()
         self._load_default() 
 
@@ -37,7 +61,7 @@ class QueensApp(tk.Tk):
         main = ttk.Frame(self, padding=10)
         main.pack(fill="both", expand=True)
 
-        self.canvas = tk.Canvas(main, width=CELL_SIZE * self.n, height=CELL_SIZE * self.n, highlightthickness=0)
+        self.canvas = tk.Canvas(main, width=self.cell * self.n, height=self.cell * self.n, highlightthickness=0)
         self.canvas.grid(row=0, column=0, sticky='nw')
 
         cfg = ttk.Frame(main)
@@ -47,7 +71,7 @@ class QueensApp(tk.Tk):
         ttk.Label(cfg, text="Algorithm:", font="bold").grid(row=0, column=0, sticky='w', pady=(0, 5))
         self.algo_var = tk.StringVar(value="BFS")
         self.algo_combo = ttk.Combobox(cfg, textvariable=self.algo_var, 
-                                       values=["BFS", "CSP (Backtracking)"], state="readonly", width=22)
+                                       values=["BFS", "CSP (Backtracking)", "CSP (Bitboard)", "Dancing Links", "Min-Conflicts"], state="readonly", width=22)
         self.algo_combo.grid(row=1, column=0, sticky='w', pady=(0, 15))
         self.algo_combo.bind("<<ComboboxSelected>>", self.on_algo_change)
 
@@ -64,11 +88,12 @@ class QueensApp(tk.Tk):
         # Custom Inputs
         self.custom_frame = ttk.Frame(cfg)
         self.custom_frame.grid(row=6, column=0, sticky='w', pady=(0, 8))
-        ttk.Label(self.custom_frame, text='Enter 8 row numbers (1-8):').grid(row=0, column=0, columnspan=self.n, sticky='w')
+        ttk.Label(self.custom_frame, text=f'Enter {self.n} row numbers (1-{self.n}):').grid(row=0, column=0, columnspan=10, sticky='w')
         self.entries = []
         for i in range(self.n):
             e = ttk.Entry(self.custom_frame, width=3, justify='center')
-            e.grid(row=1, column=i, padx=2, pady=4)
+            e.grid(row=1 + i // 10, column=i % 10, padx=2, pady=4)   # 10 boxes per line
+            e.bind('<KeyRelease>', lambda event, col=i: self.on_entry_edit(col))
             self.entries.append(e)
             e.insert(0, str(self.default_initial_1based[i]))
 
@@ -84,6 +109,17 @@ class QueensApp(tk.Tk):
         self.reset_btn = ttk.Button(btns, text='Reset', command=self.on_reset)
         self.reset_btn.grid(row=1, column=0, columnspan=3, sticky='ew', pady=4)
 
+        # Fast-forward
+        ff = ttk.Frame(btns)
+        ff.grid(row=2, column=0, columnspan=3, sticky='w')
+        self.fast_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(ff, text='Fast-forward, draw every', variable=self.fast_var).grid(row=0, column=0, sticky='w')
+        self.every_var = tk.IntVar(value=self.render_every)
+        ttk.Spinbox(ff, from_=1, to=100000, width=6, textvariable=self.every_var).grid(row=0, column=1, padx=2)
+        ttk.Label(ff, text='steps').grid(row=0, column=2, sticky='w')
+        self.turbo_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(ff, text='Turbo (full speed in background)', variable=self.turbo_var).grid(row=1, column=0, columnspan=3, sticky='w')
+
         ttk.Separator(cfg, orient='horizontal').grid(row=8, column=0, sticky='ew', pady=10)
 
         # Status
@@ -102,21 +138,31 @@ class QueensApp(tk.Tk):
 
     def _draw_board(self):
         self.canvas.delete("all")
+        cell = self.cell
         for r in range(self.n):
             for c in range(self.n):
                 color = '#DDBB88' if (r + c) % 2 == 0 else '#AA6633'
-                self.canvas.create_rectangle(c * CELL_SIZE, r * CELL_SIZE, 
-                                           (c+1) * CELL_SIZE, (r+1) * CELL_SIZE, 
+                self.canvas.create_rectangle(c * cell, r * cell, 
+                                           (c+1) * cell, (r+1) * cell, 
                                            fill=color, tags="square")
 
+        # Column highlight and one queen per column, hidden until needed
+        self.highlight_item = self.canvas.create_rectangle(0, 0, cell, self.n * cell, outline='blue', width=2,
+                                                           state='hidden', tags="highlight")
+        self.queen_items = [self.canvas.create_text(0, 0, text='♕', font=('Arial', int(cell * 0.7)),
+                                                    state='hidden', tags="queen")
+                            for _ in range(self.n)]
+        self.rendered = [None] * self.n
+
     def _ensure_active_queen(self, col, row):
-        target_x = col * CELL_SIZE + CELL_SIZE / 2
-        target_y = row * CELL_SIZE + CELL_SIZE / 2
+        cell = self.cell
+        target_x = col * cell + cell / 2
+        target_y = row * cell + cell / 2
         
         item = self.canvas.find_withtag("active_queen")
         
         if not item:
-            self.canvas.create_text(target_x, target_y, text='♕', font=('Arial', int(CELL_SIZE * 0.7)), 
+            self.canvas.create_text(target_x, target_y, text='♕', font=('Arial', int(cell * 0.7)), 
                                     fill='black', tags="active_queen")
         else:
             current_coords = self.canvas.coords(item)
@@ -142,7 +188,7 @@ class QueensApp(tk.Tk):
 
         coords = self.canvas.coords(item)
         current_y = coords[1]
-        target_y = target_row * CELL_SIZE + CELL_SIZE / 2
+        target_y = target_row * self.cell + self.cell / 2
         dist = target_y - current_y
         
         if abs(dist) < 1:
@@ -166,39 +212,40 @@ class QueensApp(tk.Tk):
         _anim_step(steps)
 
     def _update_board_state(self, fixed_queen_rows, current_col, trial_row, show_ghost_in_current=False):
-        # Clear non-active/non-board items
-        for item in self.canvas.find_all():
-            tags = self.canvas.gettags(item)
-            if "active_queen" in tags or "square" in tags:
-                continue
-            self.canvas.delete(item)
+        ''' Bring the persistent items in line with the solver state, touching
+            only the columns whose queen changed since the last call '''
+        cell = self.cell
 
         # Highlight
-        if current_col is not None and current_col < self.n:
-            self.canvas.create_rectangle(current_col * CELL_SIZE, 0, 
-                                       (current_col+1) * CELL_SIZE, self.n * CELL_SIZE, 
-                                       outline='blue', width=2, tags="highlight")
-            self.canvas.tag_lower("highlight")
-
-        # Fixed Queens
-        for col, row in enumerate(fixed_queen_rows):
-            x_center = col * CELL_SIZE + CELL_SIZE / 2
-            y_center = row * CELL_SIZE + CELL_SIZE / 2
-            self.canvas.create_text(x_center, y_center, text='♕', font=('Arial', int(CELL_SIZE * 0.7)), 
-                                    fill='black', tags="fixed_queen")
-
-        # Ghost Queens
-        start_col = len(fixed_queen_rows)
-        for col in range(start_col, self.n):
-            # Only hide ghost in current col if we are NOT asked to show it
-            if col == current_col and not show_ghost_in_current:
-                continue
-            
-            row = self.solver.initial[col]
-            x_center = col * CELL_SIZE + CELL_SIZE / 2
-            y_center = row * CELL_SIZE + CELL_SIZE / 2
-            self.canvas.create_text(x_center, y_center, text='♕', font=('Arial', int(CELL_SIZE * 0.7)), 
-                                    fill='gray', tags="ghost_queen")
+        if current_col is not None and 0 <= current_col < self.n:
+            self.canvas.coords(self.highlight_item, current_col * cell, 0, (current_col+1) * cell, self.n * cell)
+            self.canvas.itemconfig(self.highlight_item, state='normal')
+        else:
+            self.canvas.itemconfig(self.highlight_item, state='hidden')
+
+        # Fixed Queens (black), then Ghost Queens (gray) at the user's rows
+        placed = len(fixed_queen_rows)
+        initial = self.solver.initial
+        for col in range(self.n):
+            if col < placed:
+                want = (fixed_queen_rows[col], 'black')
+            elif col == current_col and not show_ghost_in_current:
+                want = None     # Only hide ghost in current col if we are NOT asked to show it
+            else:
+                want = (initial[col], 'gray')
+            if want != self.rendered[col]:
+                self._set_queen(col, want)
+
+    def _set_queen(self, col, want):
+        ''' Move/recolor the queen item of a column, or hide it (want is None) '''
+        item = self.queen_items[col]
+        if want is None:
+            self.canvas.itemconfig(item, state='hidden')
+        else:
+            row, color = want
+            self.canvas.coords(item, col * self.cell + self.cell / 2, row * self.cell + self.cell / 2)
+            self.canvas.itemconfig(item, fill=color, state='normal')
+        self.rendered[col] = want
 
     def _update_stats(self):
         elapsed = time.time() - self.solver.start_time if self.solver.start_time else 0
@@ -237,16 +284,78 @@ class QueensApp(tk.Tk):
             e.config(state=state)
         self.on_reset()
 
+    def on_entry_edit(self, col):
+        ''' A custom row box changed: apply the edits once typing pauses for
+            edit_delay ms, so typing "12" is one edit, not two '''
+        if self._edit_job is not None:
+            self.after_cancel(self._edit_job)
+        self._edit_job = self.after(self.edit_delay, self._apply_edits)
+
+    def _apply_edits(self):
+        ''' Update the solver in place (update_initial) instead of building a
+            new one. If it had already found a solution (or is re-solving an
+            earlier edit) the search goes on in turbo mode, so the window stays
+            responsive and Reset cancels it. Solvers without update_initial are reset. '''
+        self._edit_job = None
+        if self.is_animating or (self.running and self._resolving is None):
+            return
+        edits = []
+        for col, entry in enumerate(self.entries):
+            try:
+                row = int(entry.get())
+            except ValueError:
+                continue
+            if 1 <= row <= self.n and row - 1 != self.solver.initial[col]:
+                edits.append((col, row))
+        if not edits:
+            return
+        if not hasattr(self.solver, 'update_initial'):
+            self.on_reset()
+            return
+
+        resolve = self.solver.finished or self._resolving is not None
+        if self._run_job is not None:
+            self.after_cancel(self._run_job)
+            self._run_job = None
+        self._stop_turbo()  # an unfinished re-solve carries on from the new rows
+        for col, row in edits:
+            self.solver.update_initial(col, row)
+        col, row = edits[-1]
+        note = '' if self.solver.exact else ' (local repair, may differ from a fresh solve)'
+        if not resolve:
+            started = self.solver.start_time is not None
+            self._update_board_state(self.solver.state(), current_col=self.solver.col if started else -1,
+                                     trial_row=None, show_ghost_in_current=True)
+            self.status_var.set(f"Column {col + 1} now prefers row {row}.{note}")
+            return
+
+        self._resolving = f"after editing column {col + 1}.{note}"
+        self.running = True
+        self._update_controls(is_running=True)
+        self._start_turbo()
+        self.status_var.set(f"Re-solving {self._resolving}")
+
     def on_reset(self):
         self.running = False
         self.is_animating = False
         if self._run_job is not None:
             self.after_cancel(self._run_job)
             self._run_job = None
+        if self._edit_job is not None:
+            self.after_cancel(self._edit_job)
+            self._edit_job = None
+        self._stop_turbo()
+        self._resolving = None
         
         algo = self.algo_var.get()
         if algo.startswith("BFS"):
             self.solver = BFSSolver(self.n)
+        elif algo == "CSP (Bitboard)":
+            self.solver = BitboardCSPSolver(self.n)
+        elif algo == "Dancing Links":
+            self.solver = DLXSolver(self.n)
+        elif algo == "Min-Conflicts":
+            self.solver = MinConflictsSolver(self.n)
         else:
             self.solver = CSPSolver(self.n)
 
@@ -296,6 +405,13 @@ class QueensApp(tk.Tk):
             self._update_controls(is_running=False)
             return
 
+        if self.turbo_var.get() and not single_step:
+            self._start_turbo()
+            return
+        if self.fast_var.get() and not single_step:
+            self._run_fast()
+            return
+
         result, data = self.solver.step()
         self._update_stats()
 
@@ -330,7 +446,128 @@ class QueensApp(tk.Tk):
             self.status_var.set(f"Fixed column {col + 1}. Moving to next...")
             schedule_next()
             
-        elif result == 'solution':
+        else:
+            self._show_result(result, data)
+
+    def _run_fast(self):
+        ''' Fast-forward: take up to `every` solver steps per frame without
+            drawing them, then redraw the board once '''
+        try:
+            every = max(1, int(self.every_var.get()))
+        except (tk.TclError, ValueError):
+            every = self.render_every
+        frame_end = time.perf_counter() + 1.0 / self.max_fps
+
+        # advance() builds no step() payload; only a final event needs one
+        advance = self.solver.advance
+        result = None
+        for _ in range(every):
+            result = advance()
+            if result in STOP_EVENTS:
+                break
+            if time.perf_counter() >= frame_end:   # draw at least once per frame
+                break
+        self._update_stats()
+
+        if result in STOP_EVENTS:
+            self._show_result(result, event_payload(self.solver, result))
+            return
+
+        self.canvas.delete("active_queen")
+        self._update_board_state(self.solver.fixed, current_col=self.solver.col, trial_row=None, show_ghost_in_current=False)
+        self.status_var.set(f"Fast-forward: column {min(self.solver.col, self.n - 1) + 1}...")
+
+        # Cap the frame rate: wait out what is left of this frame
+        wait = int((frame_end - time.perf_counter()) * 1000)
+        self._run_job = self.after(max(1, wait), self.run_solver)
+
+    def _start_turbo(self):
+        self._turbo_cancel = threading.Event()
+        self._turbo_queue = queue.Queue(maxsize=1)
+        self._turbo_rate = (time.perf_counter(), self.solver.nodes)
+        self._turbo_thread = threading.Thread(target=self._turbo_worker,
+                                              args=(self.solver, self._turbo_cancel, self._turbo_queue, 1.0 / self.max_fps),
+                                              daemon=True)
+        self.canvas.delete("active_queen")
+        self.status_var.set("Turbo: searching...")
+        self._turbo_thread.start()
+        self._run_job = self.after(int(1000 / self.max_fps), self._drain_turbo)
+
+    @staticmethod
+    def _turbo_worker(solver, cancel, events, interval):
+        ''' Worker thread: step the solver at full speed and publish a snapshot
+            (event, nodes, col, state, data) about once per frame. Only the newest
+            snapshot is kept, so the queue never grows; the last one carries the result. '''
+        if solver.start_time is None: solver.start_time = time.time()
+        advance = solver.advance
+        next_push = time.perf_counter() + interval
+        event = None
+        while not cancel.is_set():
+            for _ in range(256):        # check the clock (and cancel) every 256 steps
+                event = advance()
+                if event in STOP_EVENTS:
+                    break
+            final = event in STOP_EVENTS
+            if final or time.perf_counter() >= next_push:
+                snapshot = (event, solver.nodes, solver.col, solver.state(),
+                            event_payload(solver, event) if final else None)
+                try:
+                    events.get_nowait()     # coalesce: drop the snapshot the UI has not drawn yet
+                except queue.Empty:
+                    pass
+                events.put_nowait(snapshot)
+                next_push = time.perf_counter() + interval
+            if final:
+                return
+
+    def _drain_turbo(self):
+        ''' UI side of turbo mode, once per frame: draw the newest snapshot '''
+        self._run_job = None
+        try:
+            event, nodes, col, state, data = self._turbo_queue.get_nowait()
+        except queue.Empty:
+            event = None
+
+        if event is not None:
+            now = time.perf_counter()
+            then, then_nodes = self._turbo_rate
+            rate = (nodes - then_nodes) / (now - then) if now > then else 0
+            self._turbo_rate = (now, nodes)
+            elapsed = time.time() - self.solver.start_time
+            self.stats_var.set(f"Nodes: {nodes} | Time: {elapsed:.2f}s | {rate:,.0f} nodes/s")
+
+            if event in STOP_EVENTS:
+                self._turbo_thread = None
+                self._show_result(event, data)
+                return
+            self._update_board_state(state, current_col=col, trial_row=None, show_ghost_in_current=False)
+            self.status_var.set(f"Turbo: column {min(col, self.n - 1) + 1}...")
+
+        if self._turbo_thread is not None and self._turbo_thread.is_alive() or not self._turbo_queue.empty():
+            self._run_job = self.after(int(1000 / self.max_fps), self._drain_turbo)
+
+    def _stop_turbo(self):
+        ''' Cancel a running worker and wait for it, so it no longer touches its solver '''
+        if self._turbo_thread is not None:
+            self._turbo_cancel.set()
+            self._turbo_thread.join()
+            self._turbo_thread = None
+
+    def _show_result(self, result, data):
+        if self._resolving is not None:
+            # re-solve after an edit: report it in the status bar, no dialog
+            note, self._resolving = self._resolving, None
+            self.running = False
+            self.canvas.delete("active_queen")
+            if result == 'solution':
+                self._update_board_state(data['state'], current_col=self.n, trial_row=None)
+                self.status_var.set(f"Re-solved {note}")
+            else:
+                self.status_var.set(f"No solution {note}")
+            self._update_controls(is_running=False)
+            return
+
+        if result == 'solution':
             self.running = False
             self.canvas.delete("active_queen")
             self.status_var.set(f"Solution found! Time: {time.time() - self.solver.start_time:.2f}s")
@@ -0,0 +1,240 @@
+import argparse
+import os
+import struct
+import sys
+import time
+from array import array
+
+from algorithms import CSPSolver, BitboardCSPSolver, SOLVERS, STOP_EVENTS
+
+# ==========================================
+# SOLVER CHECKPOINTS
+# ==========================================
+# File layout: HEADER, then length-prefixed blocks (int arrays or mask bytes).
+# Everything is little-endian, so a checkpoint can move between machines.
+MAGIC = b'NQCK'
+VERSION = 1
+HEADER = struct.Struct('<4sHBBIQqqd')   # magic, version, kind, flags, n, nodes, col, last row, elapsed seconds
+LENGTH = struct.Struct('<I')
+
+KINDS = {CSPSolver: 0, BitboardCSPSolver: 1}
+# flag bits
+TRAIL, MRV, LCV, VALID, FINISHED = 1, 2, 4, 8, 16
+
+
+class _Writer:
+    def __init__(self, f):
+        self.f = f
+
+    def ints(self, values):
+        a = array('i', values)
+        if sys.byteorder == 'big':
+            a.byteswap()
+        self.f.write(LENGTH.pack(len(a)))
+        self.f.write(a.tobytes())
+
+    def lists(self, lists):
+        ''' A list of int lists as their lengths, then all values '''
+        self.ints([len(l) for l in lists])
+        self.ints([v for l in lists for v in l])
+
+    def masks(self, masks, width):
+        data = b''.join(m.to_bytes(width, 'little') for m in masks)
+        self.f.write(LENGTH.pack(len(data)))
+        self.f.write(data)
+
+
+class _Reader:
+    def __init__(self, f):
+        self.f = f
+
+    def _block(self, size):
+        data = self.f.read(size)
+        if len(data) != size:
+            raise ValueError("truncated checkpoint")
+        return data
+
+    def ints(self):
+        count, = LENGTH.unpack(self._block(LENGTH.size))
+        a = array('i')
+        a.frombytes(self._block(count * a.itemsize))
+        if sys.byteorder == 'big':
+            a.byteswap()
+        return a.tolist()
+
+    def lists(self):
+        lengths, values = self.ints(), self.ints()
+        out, i = [], 0
+        for length in lengths:
+            out.append(values[i:i + length])
+            i += length
+        return out
+
+    def masks(self, width):
+        size, = LENGTH.unpack(self._block(LENGTH.size))
+        data = self._block(size)
+        return [int.from_bytes(data[i:i + width], 'little') for i in range(0, size, width)]
+
+
+def save(solver, path):
+    ''' Write the full search state of a CSPSolver or BitboardCSPSolver to path.
+        The file is replaced atomically, so a crash mid-write keeps the old checkpoint. '''
+    kind = KINDS.get(type(solver))
+    if kind is None:
+        raise TypeError(f"{type(solver).__name__} cannot be checkpointed")
+    flags = (VALID if solver.valid else 0) | (FINISHED if solver.finished else 0)
+    if kind == 0:
+        flags |= (TRAIL if solver.trail else 0) | (MRV if solver.variable == 'mrv' else 0) \
+                 | (LCV if solver.value == 'lcv' else 0)
+    elapsed = time.time() - solver.start_time if solver.start_time is not None else -1.0
+    last_col, last_row = solver.last
+
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, kind, flags, solver.n, solver.nodes, solver.col,
+                            -1 if last_row is None else last_row, elapsed))
+        out = _Writer(f)
+        out.ints(solver.initial)
+        out.ints([last_col])
+        out.ints(solver.fixed)
+        out.ints([c for c, _, _ in solver.stack])
+        out.ints([r for _, _, r in solver.stack])
+        if kind == 0:
+            out.lists(solver.domains)
+            for _, saved, _ in solver.stack:
+                if solver.trail:
+                    # undo log: [(col, removed rows), ...]
+                    out.ints([c for c, _ in saved])
+                    out.lists([removed for _, removed in saved])
+                else:
+                    out.lists(saved)    # full copy of every domain
+        else:
+            width = (2 * solver.n + 7) // 8     # wide enough for diagonal masks
+            out.masks([solver.rows, solver.diag, solver.anti], width)
+            out.masks(solver.domains, width)
+            out.masks([remaining for _, remaining, _ in solver.stack], width)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def load(path):
+    ''' Solver rebuilt from a checkpoint; stepping it continues the search
+        with exactly the nodes the original would have expanded next. '''
+    with open(path, 'rb') as f:
+        header = f.read(HEADER.size)
+        if len(header) != HEADER.size:
+            raise ValueError(f"{path} is not a solver checkpoint")
+        magic, version, kind, flags, n, nodes, col, last_row, elapsed = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} solver checkpoint")
+        data = _Reader(f)
+
+        if kind == 0:
+            solver = CSPSolver(n, trail=bool(flags & TRAIL), variable='mrv' if flags & MRV else 'static',
+                               value='lcv' if flags & LCV else 'preferred')
+        elif kind == 1:
+            solver = BitboardCSPSolver(n)
+        else:
+            raise ValueError(f"unknown solver kind {kind} in {path}")
+
+        solver.initial = data.ints()
+        last_col, = data.ints()
+        solver.fixed = data.ints()
+        cols, rows = data.ints(), data.ints()
+        if kind == 0:
+            solver.domains = data.lists()
+            if solver.trail:
+                saved = [list(zip(data.ints(), data.lists())) for _ in cols]
+            else:
+                saved = [data.lists() for _ in cols]
+            for c in cols:
+                solver.assigned[c] = True
+        else:
+            width = (2 * n + 7) // 8
+            solver.rows, solver.diag, solver.anti = data.masks(width)
+            solver.domains = data.masks(width)
+            saved = data.masks(width)
+        solver.stack = list(zip(cols, saved, rows))
+
+    solver.nodes = nodes
+    solver.col = col
+    solver.valid = bool(flags & VALID)
+    solver.finished = bool(flags & FINISHED)
+    solver.last = (last_col, None if last_row < 0 else last_row)
+    solver.start_time = time.time() - elapsed if elapsed >= 0 else None
+    return solver
+
+
+class Checkpointer:
+    ''' Saves a solver every `interval` seconds. maybe_save() is cheap enough
+        to call every step: it only looks at the clock. '''
+    def __init__(self, solver, path, interval=5.0):
+        self.solver = solver
+        self.path = path
+        self.interval = interval
+        self.saves = 0
+        self.next_save = time.monotonic() + interval
+
+    def maybe_save(self):
+        if time.monotonic() >= self.next_save:
+            self.save()
+            return True
+        return False
+
+    def save(self):
+        save(self.solver, self.path)
+        self.saves += 1
+        self.next_save = time.monotonic() + self.interval
+
+
+def run_with_checkpoints(solver, path, interval=5.0, max_nodes=None, check_every=4096):
+    ''' Like solver.solve(), saving a checkpoint every interval seconds (the
+        clock is read once per check_every nodes) and once more at the end '''
+    if solver.start_time is None: solver.start_time = time.time()   # start timer
+    checkpointer = Checkpointer(solver, path, interval)
+    advance = solver.advance
+    result = None
+    while result not in STOP_EVENTS:
+        for _ in range(check_every):
+            if max_nodes is not None and solver.nodes >= max_nodes:
+                result = 'limit'
+                break
+            result = advance()
+            if result in STOP_EVENTS:
+                break
+        if result == 'limit':
+            break
+        checkpointer.maybe_save()
+    checkpointer.save()
+    return {'result': result, 'state': solver.state(), 'nodes': solver.nodes,
+            'time': time.time() - solver.start_time, 'saves': checkpointer.saves}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run an N-Queens search that can be killed and resumed.")
+    parser.add_argument('n', type=int)
+    parser.add_argument('path', help="checkpoint file; resumed from if it exists")
+    parser.add_argument('--solver', default='csp-trail', choices=['csp', 'csp-trail', 'csp-mrv', 'bitboard'])
+    parser.add_argument('--initial', type=int, nargs='*', help="1-based row per column (default: all 1)")
+    parser.add_argument('--interval', type=float, default=5.0, help="seconds between checkpoints")
+    parser.add_argument('--max-nodes', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    if os.path.exists(args.path):
+        solver = load(args.path)
+        if solver.n != args.n:
+            parser.error(f"{args.path} holds an n = {solver.n} search")
+        print(f"resuming at node {solver.nodes}", file=sys.stderr)
+    else:
+        solver = SOLVERS[args.solver](args.n)
+        solver.set_initial(args.initial or [1] * args.n)
+    outcome = run_with_checkpoints(solver, args.path, args.interval, args.max_nodes)
+    rows = ' '.join('.' if r is None else str(r + 1) for r in outcome['state'])
+    print(f"{outcome['result']}: {rows} after {outcome['nodes']} nodes, "
+          f"{outcome['time']:.2f}s, {outcome['saves']} checkpoints")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,175 @@
+import json
+import time
+
+from algorithms import event_payload
+
+# ==========================================
+# SOLVER INSTRUMENTATION
+# ==========================================
+# solver method -> phase it is timed under (only methods the solver has are wrapped)
+PHASES = {
+    'conflict_with_fixed': 'conflict_check',
+    'forward_check': 'forward_check',
+    'forward_check_trail': 'forward_check',
+    'snapshot': 'domain_copy',
+    'undo': 'undo',
+    'choose_row': 'choose_row',
+    'pick_conflicted': 'pick_conflicted',
+    'place_rest': 'place_rest',
+}
+
+
+def _popcount(mask):
+    return bin(mask).count('1')
+
+
+def _list_prunes(solver, col, row, domains):
+    ''' Rows a queen on (col, row) removes from the list domains of the columns
+        forward checking visits: all of them, or up to the one it wipes out '''
+    total = 0
+    for c in solver.future(col):
+        d = abs(c - col)
+        removed = sum(1 for r in domains[c] if r == row or abs(r - row) == d)
+        total += removed
+        if removed == len(domains[c]):
+            break
+    return total
+
+
+def _bitboard_prunes(solver, col, row):
+    ''' _list_prunes for BitboardCSPSolver: popcounts of the future domain masks
+        under the queens placed so far, with and without the new one '''
+    n = solver.n
+    rows, diag, anti = solver.rows, solver.diag, solver.anti
+    new = (rows | 1 << row, diag | 1 << (row - col + n - 1), anti | 1 << (row + col))
+    total = 0
+    for c in range(col + 1, n):
+        after = solver.free_rows(c, *new)
+        total += _popcount(solver.free_rows(c, rows, diag, anti)) - _popcount(after)
+        if not after:
+            break
+    return total
+
+
+class SolverInstrumentation:
+    ''' Counters and timers for one solver. attach() wraps the solver's advance()
+        (which both step() and solve() go through) and hot-path methods on the
+        instance; detach() removes the wrappers, so a solver that is not
+        instrumented runs its plain methods at full speed.
+
+        Prunes are counted for solvers with forward checking (None for the
+        others), failed checks included: those count the rows removed up to
+        and including the domain that was wiped out. MinConflictsSolver.solve() places its first pass with
+        place_rest(), not advance(): those steps are added to the 'fixed'
+        count, but observers get no event for them. '''
+    def __init__(self, solver, observers=()):
+        self.solver = solver
+        self.observers = list(observers)    # callables observer(event, data)
+        self.attached = False
+        self.clear()
+
+    def clear(self):
+        self.events = {}    # step() event -> count
+        self.calls = {}     # phase -> number of calls
+        self.times = {}     # phase -> cumulative seconds
+        # rows removed by forward checking (None: the solver does not forward check)
+        measured = hasattr(self.solver, 'forward_check') or hasattr(self.solver, 'forward_check_trail')
+        self.prunes = 0 if measured else None
+        self.max_depth = 0  # deepest stack / number of fixed queens seen
+
+    def add_observer(self, observer):
+        self.observers.append(observer)
+
+    def remove_observer(self, observer):
+        self.observers.remove(observer)
+
+    def attach(self):
+        if self.attached:
+            return self
+        for method, phase in PHASES.items():
+            if hasattr(self.solver, method):
+                setattr(self.solver, method, self._timed(getattr(self.solver, method), phase, method))
+        self.solver.advance = self._advance(self.solver.advance)
+        self.attached = True
+        return self
+
+    def detach(self):
+        ''' Drop the wrappers (instance attributes), leaving the class methods '''
+        for method in list(PHASES) + ['advance']:
+            self.solver.__dict__.pop(method, None)
+        self.attached = False
+
+    def _add_time(self, phase, elapsed):
+        self.calls[phase] = self.calls.get(phase, 0) + 1
+        self.times[phase] = self.times.get(phase, 0.0) + elapsed
+
+    def _timed(self, func, phase, method):
+        perf_counter = time.perf_counter
+        solver = self.solver
+
+        def wrapper(*args):
+            if method == 'place_rest':
+                first_col = solver.col
+            start = perf_counter()
+            result = func(*args)
+            self._add_time(phase, perf_counter() - start)
+            if method == 'forward_check':
+                if isinstance(result, list):
+                    # list domains: compare sizes with the domains passed in
+                    assigned_col, current = args[0], args[2]
+                    self.prunes += sum(len(current[c]) - len(result[c]) for c in solver.future(assigned_col))
+                elif result is None:
+                    self.prunes += _list_prunes(solver, args[0], args[1], args[2])
+                else:
+                    # bitboard (True/False): the solver's masks do not hold the new queen yet
+                    self.prunes += _bitboard_prunes(solver, args[0], args[1])
+            elif method == 'forward_check_trail':
+                if result is not None:
+                    self.prunes += sum(len(removed) for _, removed in result)
+                else:
+                    self.prunes += _list_prunes(solver, args[0], args[1], solver.domains)
+            elif method == 'place_rest':
+                # first-pass placements made without advance()
+                self.events['fixed'] = self.events.get('fixed', 0) + solver.col - first_col
+                self.max_depth = max(self.max_depth, len(solver.fixed))
+            return result
+        return wrapper
+
+    def _advance(self, advance):
+        perf_counter = time.perf_counter
+        solver = self.solver
+
+        def wrapper():
+            start = perf_counter()
+            event = advance()
+            self._add_time('step.' + event, perf_counter() - start)
+            self.events[event] = self.events.get(event, 0) + 1
+            depth = len(getattr(solver, 'stack', solver.fixed))
+            if depth > self.max_depth:
+                self.max_depth = depth
+            if self.observers:
+                data = event_payload(solver, event)
+                for observer in self.observers:
+                    observer(event, data)
+            return event
+        return wrapper
+
+    def to_dict(self):
+        return {
+            'solver': type(self.solver).__name__,
+            'n': self.solver.n,
+            'nodes': self.solver.nodes,
+            'events': dict(self.events),
+            'prunes': self.prunes,
+            'max_depth': self.max_depth,
+            'calls': dict(self.calls),
+            'times': dict(self.times),
+        }
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.to_dict(), **kwargs)
+
+
+def instrument(solver, observers=()):
+    ''' Attach a new SolverInstrumentation to solver and return it '''
+    return SolverInstrumentation(solver, observers).attach()
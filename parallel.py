@@ -0,0 +1,103 @@
+import argparse
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from algorithms import CSPSolver, _count_from, _iter_from, _prefix_masks, symmetric_prefixes
+
+# ==========================================
+# PARALLEL SEARCH DRIVER
+# ==========================================
+def split(n, depth=1, initial=None):
+    ''' Prefixes (0-based rows of the first `depth` columns) in the order
+        CSPSolver would try them, skipping any that fail forward checking '''
+    solver = CSPSolver(n)
+    solver.set_initial(initial if initial is not None else [0] * n)    # 0 -> no preferred row
+    depth = min(depth, n)
+
+    def expand(col, domains, prefix):
+        if col == depth:
+            yield prefix
+            return
+        for r in domains[col]:
+            new_domains = solver.forward_check(col, r, domains)
+            if new_domains is not None:
+                yield from expand(col + 1, new_domains, prefix + (r,))
+
+    return list(expand(0, solver.domains, ()))
+
+
+def symmetric_split(n, depth=1):
+    ''' symmetric_prefixes extended to at least `depth` columns, as [(prefix, weight), ...] '''
+    depth = min(depth, n)
+    tasks = symmetric_prefixes(n)
+    while any(len(prefix) < depth for prefix, _ in tasks):
+        extended = []
+        for prefix, weight in tasks:
+            if len(prefix) >= depth:
+                extended.append((prefix, weight))
+                continue
+            for r in range(n):
+                if _prefix_masks(n, prefix + (r,)) is not None:
+                    extended.append((prefix + (r,), weight))
+        tasks = extended
+    return tasks
+
+
+def _first_from(args):
+    ''' Worker: first solution below a prefix (or None) '''
+    n, prefix, preferred = args
+    return next(_iter_from(n, prefix, preferred), None)
+
+
+def _count_task(args):
+    ''' Worker: number of solutions below a prefix '''
+    n, prefix, weight = args
+    return weight * _count_from(n, prefix)
+
+
+def parallel_count(n, workers=None, depth=1, symmetry=True):
+    ''' Count all solutions, one pool task per subtree. The total does not
+        depend on the worker count or the order tasks finish in.
+        With symmetry only the canonical subtrees are searched (see symmetric_prefixes). '''
+    if symmetry:
+        tasks = [(n, prefix, weight) for prefix, weight in symmetric_split(n, depth)]
+    else:
+        tasks = [(n, prefix, 1) for prefix in split(n, depth)]
+    if workers == 1:
+        return sum(map(_count_task, tasks))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return sum(pool.map(_count_task, tasks))
+
+
+def parallel_first_solution(n, initial=None, workers=None, depth=1):
+    ''' First solution in CSPSolver order (0-based rows), or None.
+        Subtrees are searched concurrently, but the answer always comes from the
+        earliest subtree that has one, so it is the same for any worker count. '''
+    preferred = [r - 1 for r in initial] if initial is not None else [-1] * n
+    tasks = [(n, prefix, preferred) for prefix in split(n, depth, initial)]
+    if workers == 1:
+        return next(filter(None, map(_first_from, tasks)), None)
+    # results in task order; leaving the block terminates the pool, so the
+    # subtrees still running stop as soon as an earlier one has the answer
+    with multiprocessing.Pool(workers) as pool:
+        for solution in pool.imap(_first_from, tasks):
+            if solution is not None:
+                return solution
+    return None
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Count or solve n-queens on a process pool.')
+    parser.add_argument('n', type=int)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--depth', type=int, default=1, choices=(1, 2),
+                        help='columns placed before splitting into tasks')
+    parser.add_argument('--first', action='store_true', help='find one solution instead of counting')
+    parser.add_argument('--no-symmetry', dest='symmetry', action='store_false',
+                        help='search every first-column placement when counting')
+    args = parser.parse_args()
+    if args.first:
+        print(parallel_first_solution(args.n, workers=args.workers, depth=args.depth))
+    else:
+        print(parallel_count(args.n, workers=args.workers, depth=args.depth, symmetry=args.symmetry))
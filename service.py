@@ -0,0 +1,350 @@
+import argparse
+import asyncio
+import http.client
+import json
+import os
+import socket
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from algorithms import SOLVERS, count_solutions
+from batch import check_rows, solve_one
+
+# ==========================================
+# LOCAL SOLVE SERVICE
+# ==========================================
+# JSON over HTTP/1.1 (TCP or a Unix socket), offline, stdlib only:
+#   POST /solve    {"rows": [1-based rows], "solver": "bitboard", "max_nodes": null}
+#   POST /count    {"n": 10, "symmetry": true}
+#   GET  /metrics
+# A worker cannot be interrupted, so every request is bounded: /solve takes
+# boards up to the solver's max_n and runs at most max_nodes nodes (the
+# service's limit when the request gives none), /count takes n up to
+# max_count_n. Requests over a limit get a 400. If a worker dies anyway
+# (e.g. killed by the OS), the pool is replaced and the request gets a 500.
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           413: 'Payload Too Large', 500: 'Internal Server Error'}
+MAX_BODY = 1 << 20
+# largest board per solver: the list CSPs hold and copy n^2 domain entries
+# per node, DLX links 4 n^2 nodes, BFS keeps whole frontiers
+MAX_N = {'bfs': 32, 'csp': 100, 'csp-trail': 100, 'csp-mrv': 100, 'bitboard': 1000,
+         'min-conflicts': 100_000, 'dlx': 200}
+
+
+class RequestError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def count_task(n, symmetry):
+    ''' Worker: count solutions and time it '''
+    start = time.time()
+    return {'n': n, 'symmetry': symmetry, 'count': count_solutions(n, symmetry), 'time': time.time() - start}
+
+
+class Endpoint:
+    ''' Request counters and recent latencies of one endpoint '''
+    def __init__(self, window=1024):
+        self.count = 0
+        self.errors = 0
+        self.latencies = deque(maxlen=window)   # seconds, most recent requests
+
+    def to_dict(self):
+        lat = sorted(self.latencies)
+        stats = {}
+        if lat:
+            stats = {'mean': 1000 * sum(lat) / len(lat), 'p50': 1000 * lat[len(lat) // 2],
+                     'p95': 1000 * lat[min(len(lat) - 1, int(len(lat) * 0.95))], 'max': 1000 * lat[-1]}
+        return {'count': self.count, 'errors': self.errors, 'latency_ms': stats}
+
+
+class SolveService:
+    ''' Solve/count requests run on a process pool. Identical requests that
+        arrive while one is running share its result (coalescing), and the
+        last cache_size results are kept (LRU), so the event loop only parses,
+        looks up and waits. '''
+    def __init__(self, workers=None, cache_size=1024, executor=None, max_nodes=1_000_000, max_count_n=14,
+                 max_n=None):
+        self.workers = workers
+        self.executor = executor or ProcessPoolExecutor(workers)
+        self.cache_size = cache_size
+        self.max_nodes = max_nodes  # node limit per /solve request
+        self.max_count_n = max_count_n  # largest n for /count
+        self.max_n = {**MAX_N, **(max_n or {})}     # largest board per solver for /solve
+        self.restarts = 0   # pools replaced after a worker died
+        self.cache = OrderedDict()  # key -> result
+        self.inflight = {}  # key -> future shared by every waiter
+        self.started = time.time()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.endpoints = {}
+        self.recent = deque()   # completion times over the last minute, for throughput
+
+    async def _run(self, key, func, *args, retry=True):
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return self.cache[key]
+        future = self.inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            loop = asyncio.get_running_loop()
+            executor = self.executor
+            try:
+                future = loop.run_in_executor(executor, func, *args)
+            except BrokenProcessPool:
+                self._restart(executor)     # already known to be broken: submit to a new pool
+                executor = self.executor
+                future = loop.run_in_executor(executor, func, *args)
+            self.inflight[key] = future
+            future.add_done_callback(lambda f: self._finished(key, f, executor))
+        try:
+            return await asyncio.shield(future)     # a client going away does not cancel the others
+        except BrokenProcessPool:
+            # the pool lost a worker (maybe before this request came in); _finished
+            # has replaced it, so try once more before giving up
+            if retry:
+                return await self._run(key, func, *args, retry=False)
+            raise RequestError(500, "a solver process died; the worker pool was restarted")
+
+    def _restart(self, broken):
+        ''' Replace a pool that lost a worker: a broken pool refuses every later task '''
+        if self.executor is broken:
+            broken.shutdown(wait=False, cancel_futures=True)
+            self.executor = ProcessPoolExecutor(self.workers)
+            self.restarts += 1
+
+    def _finished(self, key, future, executor):
+        self.inflight.pop(key, None)
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            if isinstance(future.exception(), BrokenProcessPool):
+                self._restart(executor)
+            return
+        self.cache[key] = future.result()
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    async def solve(self, rows, solver='bitboard', max_nodes=None):
+        error = check_rows(rows)
+        if error is not None:
+            raise RequestError(400, error)
+        if solver not in SOLVERS:
+            raise RequestError(400, f"unknown solver {solver!r}, expected one of {sorted(SOLVERS)}")
+        if len(rows) > self.max_n.get(solver, 0):
+            raise RequestError(400, f"{solver} takes boards up to n = {self.max_n.get(solver, 0)}")
+        if max_nodes is None:
+            max_nodes = self.max_nodes
+        elif type(max_nodes) is not int or max_nodes < 1:
+            raise RequestError(400, "max_nodes must be a positive integer")
+        elif max_nodes > self.max_nodes:
+            raise RequestError(400, f"max_nodes must be at most {self.max_nodes}")
+        key = ('solve', len(rows), tuple(rows), solver, max_nodes)
+        record = await self._run(key, solve_one, (None, rows, None, solver, max_nodes))
+        record = dict(record)
+        del record['id']
+        return record
+
+    async def count(self, n, symmetry=True):
+        if type(n) is not int or n < 1:
+            raise RequestError(400, "n must be a positive integer")
+        if n > self.max_count_n:
+            raise RequestError(400, f"n must be at most {self.max_count_n}")
+        return await self._run(('count', n, bool(symmetry)), count_task, n, bool(symmetry))
+
+    def metrics(self):
+        now = time.time()
+        while self.recent and self.recent[0] < now - 60:
+            self.recent.popleft()
+        uptime = now - self.started
+        return {
+            'uptime': uptime,
+            'requests': sum(e.count for e in self.endpoints.values()),
+            'per_second_last_minute': len(self.recent) / min(60.0, max(uptime, 1e-9)),
+            'in_flight': len(self.inflight),
+            'pool_restarts': self.restarts,
+            'coalesced': self.coalesced,
+            'cache': {'size': len(self.cache), 'hits': self.hits, 'misses': self.misses},
+            'endpoints': {path: e.to_dict() for path, e in self.endpoints.items()},
+        }
+
+    async def dispatch(self, method, path, body):
+        if path == '/metrics':
+            if method != 'GET':
+                raise RequestError(405, "use GET")
+            return self.metrics()
+        if path not in ('/solve', '/count'):
+            raise RequestError(404, f"no endpoint {path}")
+        if method != 'POST':
+            raise RequestError(405, "use POST")
+        try:
+            request = json.loads(body or b'{}')
+        except ValueError as e:
+            raise RequestError(400, f"bad JSON: {e}")
+        if not isinstance(request, dict):
+            raise RequestError(400, "request must be a JSON object")
+        if path == '/solve':
+            return await self.solve(request.get('rows'), request.get('solver', 'bitboard'), request.get('max_nodes'))
+        return await self.count(request.get('n'), request.get('symmetry', True))
+
+    async def handle(self, reader, writer):
+        ''' One connection: HTTP/1.1 requests until the client closes it '''
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                start = time.perf_counter()
+                path = '?'
+                try:
+                    method, target, _ = request_line.decode('latin-1').split(' ', 2)
+                    path = target.split('?', 1)[0]
+                    length = int(headers.get('content-length', 0))
+                    if length > MAX_BODY:
+                        raise RequestError(413, "request body too large")
+                    body = await reader.readexactly(length) if length else b''
+                    status, payload = 200, await self.dispatch(method, path, body)
+                except RequestError as e:
+                    status, payload = e.status, {'error': str(e)}
+                except ValueError:
+                    status, payload = 400, {'error': "malformed request"}
+                except asyncio.IncompleteReadError:
+                    break
+                except Exception as e:  # a failing worker must not take the server down
+                    status, payload = 500, {'error': f"{type(e).__name__}: {e}"}
+
+                endpoint = self.endpoints.setdefault(path if path in ('/solve', '/count', '/metrics') else 'other', Endpoint())
+                endpoint.count += 1
+                endpoint.errors += status != 200
+                endpoint.latencies.append(time.perf_counter() - start)
+                self.recent.append(time.time())
+
+                data = json.dumps(payload).encode()
+                # after a rejected body or request line the stream is out of step: hang up
+                close = headers.get('connection', '').lower() == 'close' or status == 413 or path == '?'
+                head = f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                if close:
+                    head += "Connection: close\r\n"
+                writer.write(head.encode() + b"\r\n" + data)
+                await writer.drain()
+                if close:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8765, unix=None):
+        if unix is not None:
+            server = await asyncio.start_unix_server(self.handle, path=unix)
+        else:
+            server = await asyncio.start_server(self.handle, host, port)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+
+
+# ==========================================
+# CLIENT
+# ==========================================
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path, timeout=None):
+        super().__init__('localhost', timeout=timeout)
+        self.unix_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.unix_path)
+
+
+class SolveClient:
+    ''' Blocking client for the service; keeps one connection open '''
+    def __init__(self, host='127.0.0.1', port=8765, unix=None, timeout=None):
+        if unix is not None:
+            self.conn = _UnixHTTPConnection(unix, timeout)
+        else:
+            self.conn = http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def request(self, method, path, payload=None):
+        ''' (status, decoded JSON response) '''
+        body = None if payload is None else json.dumps(payload)
+        self.conn.request(method, path, body, {'Content-Type': 'application/json'})
+        response = self.conn.getresponse()
+        return response.status, json.loads(response.read())
+
+    def _checked(self, method, path, payload=None):
+        status, data = self.request(method, path, payload)
+        if status != 200:
+            raise ValueError(f"{path}: {status} {data.get('error')}")
+        return data
+
+    def solve(self, rows, solver='bitboard', max_nodes=None):
+        return self._checked('POST', '/solve', {'rows': list(rows), 'solver': solver, 'max_nodes': max_nodes})
+
+    def count(self, n, symmetry=True):
+        return self._checked('POST', '/count', {'n': n, 'symmetry': symmetry})
+
+    def metrics(self):
+        return self._checked('GET', '/metrics')
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve N-Queens solve/count requests as JSON over local HTTP.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', default=None, help="listen on this Unix socket path instead of TCP")
+    parser.add_argument('--workers', type=int, default=None, help="solver processes (default: one per CPU)")
+    parser.add_argument('--cache-size', type=int, default=1024, help="results kept for repeated requests")
+    parser.add_argument('--max-nodes', type=int, default=1_000_000, help="node limit per /solve request")
+    parser.add_argument('--max-count-n', type=int, default=14, help="largest n accepted by /count")
+    parser.add_argument('--max-n', action='append', default=[], metavar='SOLVER=N',
+                        help="largest board for a solver on /solve (repeatable), default "
+                             + ', '.join(f"{name}={n}" for name, n in MAX_N.items()))
+    args = parser.parse_args(argv)
+
+    max_n = {}
+    for item in args.max_n:
+        name, _, value = item.partition('=')
+        if name not in SOLVERS or not value.isdigit():
+            parser.error(f"--max-n expects SOLVER=N with SOLVER one of {sorted(SOLVERS)}, not {item!r}")
+        max_n[name] = int(value)
+    service = SolveService(args.workers or os.cpu_count(), args.cache_size,
+                           max_nodes=args.max_nodes, max_count_n=args.max_count_n, max_n=max_n)
+    where = args.unix or f"http://{args.host}:{args.port}"
+    print(f"serving on {where}", flush=True)
+    try:
+        asyncio.run(service.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+
+if __name__ == '__main__':
+    main()
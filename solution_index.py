@@ -0,0 +1,107 @@
+import os
+import struct
+from array import array
+from functools import lru_cache
+
+from algorithms import iter_solutions
+
+# ==========================================
+# SOLUTION INDEX
+# ==========================================
+MAGIC = b'NQIX'
+VERSION = 1
+HEADER = struct.Struct('<4sHHI')    # magic, version, n, number of solutions
+
+
+class SolutionIndex:
+    ''' Every solution for one board size, stored as a flat byte array
+        (solution i is rows[i*n:(i+1)*n], 0-based) with a lookup for the
+        solution that moves the fewest queens away from an initial configuration. '''
+    def __init__(self, n, rows, cache_size=4096):
+        self.n = n
+        self.rows = rows
+        self.count = len(rows) // n if n else 0
+        # match bitsets: bit i of self.masks[c][r] is set if solution i has its queen at (c, r)
+        self.masks = self._build_masks()
+        self.nearest = lru_cache(maxsize=cache_size)(self._nearest)    # memo of repeated queries
+
+    @classmethod
+    def build(cls, n, **kwargs):
+        ''' Enumerate all solutions for an n x n board (meant for n up to about 12) '''
+        rows = array('B')
+        for s in iter_solutions(n):
+            rows.extend(s)
+        return cls(n, rows, **kwargs)
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        with open(path, 'rb') as f:
+            magic, version, n, count = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not a version {VERSION} solution index")
+            rows = array('B')
+            rows.fromfile(f, count * n)
+        return cls(n, rows, **kwargs)
+
+    @classmethod
+    def load_or_build(cls, n, path, **kwargs):
+        ''' Load the index from path, building and saving it there first if missing '''
+        if os.path.exists(path):
+            index = cls.load(path, **kwargs)
+            if index.n == n:
+                return index
+        index = cls.build(n, **kwargs)
+        index.save(path)
+        return index
+
+    def save(self, path):
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.n, self.count))
+            self.rows.tofile(f)
+        os.replace(tmp, path)   # never leave a half-written index behind
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        return tuple(self.rows[i * self.n:(i + 1) * self.n])
+
+    def _build_masks(self):
+        n, count = self.n, self.count
+        bits = [[bytearray((count + 7) // 8) for _ in range(n)] for _ in range(n)]
+        for i in range(count):
+            byte, bit = i >> 3, 1 << (i & 7)
+            for c, r in enumerate(self.rows[i * n:(i + 1) * n]):
+                bits[c][r][byte] |= bit
+        return [[int.from_bytes(b, 'little') for b in col] for col in bits]
+
+    def _nearest(self, initial):
+        ''' (solution, queens moved) for a tuple of 1-based rows, or None if there are no solutions '''
+        if not self.count:
+            return None
+        # bit-sliced counter: planes[j] holds bit j of every solution's number of matching columns
+        planes = []
+        for c, r in enumerate(initial):
+            carry = self.masks[c][r - 1] if 1 <= r <= self.n else 0
+            for j in range(len(planes)):
+                if not carry:
+                    break
+                planes[j], carry = planes[j] ^ carry, planes[j] & carry
+            if carry:
+                planes.append(carry)
+
+        # keep the solutions with the highest count, deciding one bit at a time from the top
+        best = (1 << self.count) - 1
+        matches = 0
+        for j in reversed(range(len(planes))):
+            if best & planes[j]:
+                best &= planes[j]
+                matches |= 1 << j
+        i = (best & -best).bit_length() - 1   # ties go to the first solution in enumeration order
+        return self[i], self.n - matches
+
+    def nearest_solution(self, initial):
+        ''' Solution (0-based rows) with the fewest queens moved from initial
+            (1-based rows, as taken by set_initial), and how many queens move '''
+        return self.nearest(tuple(initial))
@@ -0,0 +1,60 @@
+import random
+
+from algorithms import BFSSolver
+
+# ==========================================
+# BREADTH-FIRST SEARCH
+# ==========================================
+# BFSSolver expands whole levels, so it finds a solution whenever one exists
+# (n = 1 and n >= 4), counts every conflict-free partial placement per level,
+# and gives the same events whether a level stays in memory or is spilled.
+
+
+def is_solution(rows):
+    n = len(rows)
+    return (sorted(rows) == list(range(n)) and len({r - c for c, r in enumerate(rows)}) == n
+            and len({r + c for c, r in enumerate(rows)}) == n)
+
+
+def partial_placements(n, depth):
+    ''' Brute force: queens in columns 0..depth-1 that do not attack each other '''
+    def extend(rows):
+        if len(rows) == depth:
+            return 1
+        c = len(rows)
+        return sum(extend(rows + [r]) for r in range(n)
+                   if all(r != q and abs(r - q) != c - k for k, q in enumerate(rows)))
+    return extend([])
+
+
+def test_finds_a_solution_when_one_exists():
+    # the old greedy placer gave up ('invalid') on most of these
+    for n in range(1, 10):
+        solver = BFSSolver(n)
+        solver.set_initial([1] * n)
+        out = solver.solve()
+        if n in (2, 3):
+            assert out['result'] == 'invalid'
+        else:
+            assert out['result'] == 'solution' and is_solution(out['state']), n
+
+
+def test_level_counts():
+    for n in range(4, 8):
+        solver = BFSSolver(n)
+        solver.set_initial([1] * n)
+        solver.solve()
+        # every level but the last is expanded in full before the solution turns up
+        assert solver.level_counts[:n] == [partial_placements(n, d) for d in range(n)], n
+
+
+def test_spill_matches_memory():
+    rng = random.Random(0)
+    for _ in range(20):
+        n = rng.choice((5, 6, 7, 8))
+        rows = [rng.randint(1, n) for _ in range(n)]
+        memory, spilled = BFSSolver(n), BFSSolver(n, memory_limit=64)  # 64 bytes: the big levels spill
+        memory.set_initial(rows)
+        spilled.set_initial(rows)
+        assert list(spilled.events()) == list(memory.events()), (n, rows)
+        assert spilled.level_counts == memory.level_counts
@@ -0,0 +1,48 @@
+import os
+import random
+import tempfile
+
+import checkpoint
+from algorithms import SOLVERS, STOP_EVENTS
+
+# ==========================================
+# CHECKPOINT RESUME
+# ==========================================
+# A solver loaded from a checkpoint must continue with exactly the events
+# (and node counts) the original solver produces from the same point.
+CHECKPOINTED = ('csp', 'csp-trail', 'csp-mrv', 'bitboard')
+
+
+def check_resume(name, n, rows, steps, path):
+    original = SOLVERS[name](n)
+    original.set_initial(rows)
+    for _ in range(steps):
+        if original.step()[0] in STOP_EVENTS:
+            break
+    checkpoint.save(original, path)
+    resumed = checkpoint.load(path)
+    assert resumed.nodes == original.nodes and resumed.state() == original.state()
+    while True:
+        expected, got = original.step(), resumed.step()
+        assert got == expected and resumed.nodes == original.nodes, (name, n, rows, steps, expected, got)
+        if expected[0] in STOP_EVENTS:
+            break
+
+
+def test_resume_continues_identically():
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'run.ckpt')
+        for name in CHECKPOINTED:
+            for _ in range(15):
+                n = rng.choice((4, 6, 8, 10, 13))
+                rows = [rng.randint(1, n) for _ in range(n)]
+                check_resume(name, n, rows, rng.randint(0, 300), path)
+
+
+def test_resume_after_finish():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'run.ckpt')
+        for name in CHECKPOINTED:
+            check_resume(name, 8, [1] * 8, 10 ** 6, path)     # solved before saving
+            check_resume(name, 3, [1] * 3, 10 ** 6, path)     # no solution
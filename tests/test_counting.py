@@ -0,0 +1,25 @@
+from algorithms import canonical, count_solutions, iter_solutions, iter_unique_solutions, symmetries
+
+# ==========================================
+# SOLUTION COUNTS
+# ==========================================
+# Known values: all solutions (OEIS A000170) and solutions up to rotation
+# and reflection (OEIS A002562) for n = 1..10.
+TOTAL = [1, 0, 0, 2, 10, 4, 40, 92, 352, 724]
+UNIQUE = [1, 0, 0, 1, 2, 1, 6, 12, 46, 92]
+
+
+def test_counts_with_and_without_symmetry():
+    for n, total in enumerate(TOTAL, 1):
+        assert count_solutions(n, symmetry=False) == total, n
+        assert count_solutions(n, symmetry=True) == total, n
+
+
+def test_unique_solutions():
+    for n, unique in enumerate(UNIQUE, 1):
+        found = list(iter_unique_solutions(n))
+        assert len(found) == unique, n
+        assert all(s == canonical(s) for s in found)
+        # the symmetry classes of the unique solutions cover every solution exactly once
+        covered = [b for s in found for b in symmetries(s)]
+        assert sorted(covered) == sorted(iter_solutions(n)), n
@@ -0,0 +1,35 @@
+from algorithms import DLXSolver, iter_solutions
+
+# ==========================================
+# DANCING LINKS
+# ==========================================
+# all_solutions counts must match OEIS A000170; in single-solution mode the
+# static order finds the same first solution as the other solvers.
+TOTAL = [1, 0, 0, 2, 10, 4, 40, 92, 352]
+
+
+def test_all_solutions_counts():
+    for variable in DLXSolver.VARIABLE_ORDERS:
+        for n, total in enumerate(TOTAL, 1):
+            solver = DLXSolver(n, variable=variable, all_solutions=True)
+            solver.set_initial([1] * n)
+            out = solver.solve()
+            assert out['solutions'] == total, (variable, n)
+            assert out['result'] == ('done' if total else 'invalid'), (variable, n)
+
+
+def test_all_solutions_events_list_every_solution():
+    solver = DLXSolver(6, all_solutions=True)
+    solver.set_initial([1] * 6)
+    found = [tuple(data['state']) for event, data in solver.events() if event == 'solution']
+    assert found == list(iter_solutions(6))
+
+
+def test_first_solution_matches_enumeration_order():
+    for n in (1, 4, 5, 6, 8):
+        for initial in ([1] * n, list(range(n, 0, -1))):
+            solver = DLXSolver(n)
+            solver.set_initial(initial)
+            out = solver.solve()
+            assert out['result'] == 'solution'
+            assert tuple(out['state']) == next(iter_solutions(n, initial)), (n, initial)
@@ -0,0 +1,44 @@
+import os
+import random
+import tempfile
+
+from algorithms import iter_solutions
+from solution_index import SolutionIndex
+
+# ==========================================
+# NEAREST SOLUTION
+# ==========================================
+# SolutionIndex.nearest_solution must agree with a brute-force scan of every
+# solution: fewest queens moved, ties to the first solution enumerated.
+
+
+def brute_nearest(n, initial):
+    best = None
+    for s in iter_solutions(n):
+        moved = sum(r + 1 != want for r, want in zip(s, initial))
+        if best is None or moved < best[1]:
+            best = (s, moved)
+    return best
+
+
+def test_nearest_matches_brute_force():
+    rng = random.Random(3)
+    for n in (1, 4, 5, 6, 8):
+        index = SolutionIndex.build(n)
+        for _ in range(30):
+            initial = [rng.randint(1, n) for _ in range(n)]
+            assert index.nearest_solution(initial) == brute_nearest(n, initial), (n, initial)
+
+
+def test_no_solutions():
+    assert SolutionIndex.build(3).nearest_solution([1, 2, 3]) is None
+
+
+def test_save_and_load():
+    index = SolutionIndex.build(6)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'six.nqix')
+        index.save(path)
+        loaded = SolutionIndex.load(path)
+    assert len(loaded) == 4 and [loaded[i] for i in range(4)] == list(iter_solutions(6))
+    assert loaded.nearest_solution([1] * 6) == index.nearest_solution([1] * 6)
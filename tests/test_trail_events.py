@@ -0,0 +1,45 @@
+import random
+
+from algorithms import CSPSolver, BitboardCSPSolver
+
+# ==========================================
+# TRAIL VS SNAPSHOT EVENT STREAMS
+# ==========================================
+# The trail (undo log) and snapshot (domain copies) CSP modes, and the
+# bitboard CSP, must expand the same nodes in the same order: every step()
+# event and payload has to match.
+SIZES = (1, 2, 3, 4, 5, 6, 8, 10, 12)
+MAX_NODES = 20000
+
+
+def events(solver, rows, max_nodes=MAX_NODES):
+    ''' step() events of a run, up to a solution/invalid or max_nodes '''
+    solver.set_initial(rows)
+    out = []
+    while solver.nodes < max_nodes:
+        event, data = solver.step()
+        out.append((event, data))
+        if event in ('solution', 'invalid'):
+            break
+    return out
+
+
+def test_trail_matches_snapshot():
+    rng = random.Random(1)
+    for n in SIZES:
+        for _ in range(20):
+            rows = [rng.randint(1, n) for _ in range(n)]
+            snapshot = events(CSPSolver(n), rows)
+            assert events(CSPSolver(n, trail=True), rows) == snapshot, (n, rows)
+            assert events(BitboardCSPSolver(n), rows) == snapshot, (n, rows)
+
+
+def test_trail_matches_snapshot_with_heuristics():
+    rng = random.Random(2)
+    for n in SIZES:
+        for variable in CSPSolver.VARIABLE_ORDERS:
+            for value in CSPSolver.VALUE_ORDERS:
+                rows = [rng.randint(1, n) for _ in range(n)]
+                snapshot = events(CSPSolver(n, variable=variable, value=value), rows)
+                trail = events(CSPSolver(n, trail=True, variable=variable, value=value), rows)
+                assert trail == snapshot, (n, variable, value, rows)
@@ -0,0 +1,61 @@
+import random
+
+from algorithms import SOLVERS, MinConflictsSolver
+
+# ==========================================
+# INCREMENTAL RE-SOLVE
+# ==========================================
+# update_initial(col, row) after any amount of searching must end in the
+# same result and board as a fresh solve of the edited configuration.
+EXACT = ('csp', 'csp-trail', 'csp-mrv', 'bitboard')
+
+
+def fresh(name, n, rows):
+    solver = SOLVERS[name](n)
+    solver.set_initial(rows)
+    return solver.solve()
+
+
+def test_random_edits_match_fresh_solve():
+    rng = random.Random(7)
+    for name in EXACT:
+        for _ in range(150):
+            n = rng.choice((4, 5, 6, 8, 10, 12))
+            rows = [rng.randint(1, n) for _ in range(n)]
+            solver = SOLVERS[name](n)
+            solver.set_initial(rows)
+            solver.solve(rng.choice((0, 5, 50, None)))     # stop anywhere, or finish
+            for _ in range(3):
+                col, row = rng.randrange(n), rng.randint(1, n)
+                rows[col] = row
+                solver.update_initial(col, row)
+                if rng.random() < 0.5:
+                    solver.solve(solver.nodes + rng.randint(0, 30))
+            out, ref = solver.solve(), fresh(name, n, rows)
+            assert (out['result'], out['state']) == (ref['result'], ref['state']), (name, n, rows)
+
+
+def test_late_edit_reuses_the_search():
+    n = 16
+    rows = [1] * n
+    for name in ('csp-trail', 'bitboard'):
+        solver = SOLVERS[name](n)
+        solver.set_initial(rows)
+        solver.solve()
+        before = solver.nodes
+        edited = rows[:]
+        edited[n - 3] = 2
+        solver.update_initial(n - 3, 2)
+        out, ref = solver.solve(), fresh(name, n, edited)
+        assert out['state'] == ref['state']
+        assert solver.nodes - before < ref['nodes']
+
+
+def test_min_conflicts_edit_before_start_is_exact():
+    solver = MinConflictsSolver(50, seed=1)
+    solver.set_initial([1] * 50)
+    solver.update_initial(10, 5)
+    assert solver.exact
+    ref = MinConflictsSolver(50, seed=1)
+    ref.set_initial([1] * 10 + [5] + [1] * 39)
+    assert solver.solve()['state'] == ref.solve()['state']
@@ -0,0 +1,224 @@
+import argparse
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from algorithms import SOLVERS, STOP_EVENTS
+
+# ==========================================
+# SEARCH TRACE FILES
+# ==========================================
+# A trace is the solver's event stream, one fixed-width record per step:
+#   <path>      header + records (event code, col, row)
+#   <path>.idx  header + the board after every `interval` steps (checkpoints)
+# Board replay: 'fixed' puts column col's queen on row, 'backtracking' takes it
+# off again, the other events leave the board as it is. That is exact for the
+# depth-first solvers and min-conflicts; BFSSolver jumps between states of a
+# level, so for it only the records themselves are exact.
+EVENTS = ('searching', 'fixed', 'backtracking', 'solution', 'invalid', 'done')
+CODES = {event: code for code, event in enumerate(EVENTS)}
+
+MAGIC = b'NQTR'
+INDEX_MAGIC = b'NQTI'
+VERSION = 1
+HEADER = struct.Struct('<4sHIIc')   # magic, version, n, checkpoint interval, typecode of col/row
+
+
+def typecode_for(n):
+    ''' 2-byte columns/rows up to n = 65535, 4-byte above; all-ones means "none" '''
+    return 'H' if n < 0xFFFF else 'I'
+
+
+class TraceRecorder:
+    ''' Writes a trace while a search runs. Use record(event, col, row), or pass
+        the recorder as an instrumentation observer (observer(event, data)). '''
+    def __init__(self, path, n, interval=4096, buffer_size=1 << 16):
+        self.path = path
+        self.n = n
+        self.interval = interval
+        self.typecode = typecode_for(n)
+        self.none = (1 << (8 * array(self.typecode).itemsize)) - 1
+        self.record_struct = struct.Struct('<B' + self.typecode * 2)
+        self.buffer_size = buffer_size
+
+        self.count = 0  # records written
+        self.board = array(self.typecode, [self.none]) * n  # board after the last record
+        self.buffer = bytearray()
+
+        header = HEADER.pack(MAGIC, VERSION, n, interval, self.typecode.encode())
+        self.file = open(path, 'wb')
+        self.file.write(header)
+        self.index = open(path + '.idx', 'wb')
+        self.index.write(INDEX_MAGIC + header[4:])
+        self.board.tofile(self.index)   # checkpoint 0: the empty board
+
+    def record(self, event, col=None, row=None):
+        none = self.none
+        col = none if col is None else col
+        row = none if row is None else row
+        self.buffer += self.record_struct.pack(CODES[event], col, row)
+        if event == 'fixed':
+            self.board[col] = row
+        elif event == 'backtracking':
+            self.board[col] = none
+        self.count += 1
+        if self.count % self.interval == 0:
+            self.board.tofile(self.index)
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def __call__(self, event, data):
+        self.record(event, data.get('col'), data.get('row'))
+
+    def flush(self):
+        self.file.write(self.buffer)
+        self.buffer.clear()
+
+    def close(self):
+        if self.file is not None:
+            self.flush()
+            self.file.close()
+            self.index.close()
+            self.file = self.index = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def record_search(solver, path, interval=4096, max_nodes=None):
+    ''' Run solver to the end (or max_nodes) writing every step to a trace;
+        returns the last event. Uses advance(), so no step() payloads are built. '''
+    advance = solver.advance
+    event = None
+    with TraceRecorder(path, solver.n, interval) as recorder:
+        record = recorder.record
+        while event not in STOP_EVENTS:
+            if max_nodes is not None and solver.nodes >= max_nodes:
+                break
+            event = advance()
+            col, row = solver.last if event != 'solution' and event != 'done' else (None, None)
+            record(event, col, row)
+    return event
+
+
+class Trace:
+    ''' Memory-mapped reader: trace[i] is step i as (event, col, row) in O(1),
+        board_at(k) is the board after the first k steps (row per column, None
+        if empty), replayed from the nearest checkpoint, i.e. at most interval - 1 records. '''
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            magic, version, n, interval, typecode = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not a version {VERSION} trace")
+            size = os.fstat(f.fileno()).st_size
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        with open(path + '.idx', 'rb') as f:
+            isize = os.fstat(f.fileno()).st_size
+            self.index_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.index_map[:4] != INDEX_MAGIC:
+            raise ValueError(f"{path}.idx is not a trace checkpoint index")
+
+        self.n = n
+        self.interval = interval
+        self.typecode = typecode.decode()
+        self.none = (1 << (8 * array(self.typecode).itemsize)) - 1
+        self.record_struct = struct.Struct('<B' + self.typecode * 2)
+        self.board_size = n * array(self.typecode).itemsize
+        self.count = (size - HEADER.size) // self.record_struct.size
+        self.checkpoints = (isize - HEADER.size) // self.board_size if self.board_size else 0
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError('trace index out of range')
+        code, col, row = self.record_struct.unpack_from(self.map, HEADER.size + i * self.record_struct.size)
+        none = self.none
+        return EVENTS[code], None if col == none else col, None if row == none else row
+
+    def __iter__(self):
+        none = self.none
+        size = self.record_struct.size
+        chunk = 65536 * size    # read in slices, not the whole map at once
+        stop = HEADER.size + self.count * size
+        for start in range(HEADER.size, stop, chunk):
+            for code, col, row in self.record_struct.iter_unpack(self.map[start:min(start + chunk, stop)]):
+                yield EVENTS[code], None if col == none else col, None if row == none else row
+
+    def checkpoint(self, j):
+        ''' Board (array, all-ones for empty) after j * interval steps '''
+        offset = HEADER.size + j * self.board_size
+        board = array(self.typecode)
+        board.frombytes(self.index_map[offset:offset + self.board_size])
+        return board
+
+    def board_at(self, k):
+        if not 0 <= k <= self.count:
+            raise IndexError('step out of range')
+        j = min(k // self.interval, self.checkpoints - 1)
+        board = self.checkpoint(j)
+        none = self.none
+        size = self.record_struct.size
+        unpack_from = self.record_struct.unpack_from
+        for i in range(j * self.interval, k):
+            code, col, row = unpack_from(self.map, HEADER.size + i * size)
+            if code == 1:   # fixed
+                board[col] = row
+            elif code == 2:     # backtracking
+                board[col] = none
+        return [None if r == none else r for r in board]
+
+    def close(self):
+        if self.map is not None:
+            self.map.close()
+        self.index_map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record an N-Queens search to a trace file, or inspect one.")
+    sub = parser.add_subparsers(dest='command', required=True)
+    rec = sub.add_parser('record', help="run a search and write its trace")
+    rec.add_argument('n', type=int)
+    rec.add_argument('out', help="trace path (the checkpoint index goes to OUT.idx)")
+    rec.add_argument('--solver', default='csp', choices=sorted(SOLVERS))
+    rec.add_argument('--initial', type=int, nargs='*', help="1-based row per column (default: all 1)")
+    rec.add_argument('--interval', type=int, default=4096, help="steps between checkpoints")
+    rec.add_argument('--max-nodes', type=int, default=None)
+    show = sub.add_parser('show', help="print the board after step K")
+    show.add_argument('path')
+    show.add_argument('step', type=int, nargs='?', help="default: the last step")
+    args = parser.parse_args(argv)
+
+    if args.command == 'record':
+        solver = SOLVERS[args.solver](args.n)
+        solver.set_initial(args.initial or [1] * args.n)
+        event = record_search(solver, args.out, args.interval, args.max_nodes)
+        print(f"{solver.nodes} steps, last event: {event}", file=sys.stderr)
+        return 0
+
+    with Trace(args.path) as trace:
+        k = len(trace) if args.step is None else args.step
+        if k > 0:
+            print(f"step {k}: {trace[k - 1]}")
+        board = trace.board_at(k)
+        for r in range(trace.n):
+            print(' '.join('Q' if row == r else '.' for row in board))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
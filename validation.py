@@ -0,0 +1,122 @@
+import argparse
+import json
+import sys
+
+import numpy as np
+
+from batch import read_csv, read_jsonl
+
+# ==========================================
+# VECTORIZED BOARD SCORING (needs numpy)
+# ==========================================
+BUDGET = 1 << 22    # count-table cells (int64) per pass, about 32 MB
+def _pairs(keys, boards, width):
+    ''' Attacking pairs per board: keys[i] are the line ids (0..width-1, already
+        offset by i * width) of board i's queens; a line with m queens adds m*(m-1)/2 '''
+    counts = np.bincount(keys.ravel(), minlength=boards * width).reshape(boards, width)
+    return (counts * (counts - 1) // 2).sum(axis=1)
+
+
+def score_boards(boards, one_based=True, chunk_size=None, budget=BUDGET):
+    ''' Validate and score many boards at once. boards is a (k, N) integer array
+        (or nested lists) with one row per column, 1-based like set_initial
+        unless one_based is False. Returns a dict of length-k arrays:
+        valid, row_conflicts and diagonal_conflicts (attacking pairs, both
+        diagonal directions) and conflicts (their sum). Boards with a row
+        outside the board are invalid and get -1 counts. Boards are scored
+        chunk_size at a time, by default as many as fit the budget of count
+        table cells (2N per board). '''
+    boards = np.asarray(boards)
+    if boards.ndim != 2:
+        raise ValueError(f"boards must be a (k, N) array, not shape {boards.shape}")
+    k, n = boards.shape
+    row_conflicts = np.empty(k, dtype=np.int64)
+    diagonal_conflicts = np.empty(k, dtype=np.int64)
+    in_range = np.empty(k, dtype=bool)
+    cols = np.arange(n)
+    lines = 2 * n - 1   # diagonals per direction
+    if chunk_size is None:
+        chunk_size = max(1, budget // (2 * n))
+
+    # in chunks, so the count tables stay small however many (and however big) boards there are
+    for start in range(0, k, chunk_size):
+        rows = boards[start:start + chunk_size].astype(np.int64)
+        if one_based:
+            rows -= 1
+        m = len(rows)
+        ok = ((rows >= 0) & (rows < n)).all(axis=1)
+        np.clip(rows, 0, n - 1, out=rows)
+        offsets = np.arange(m, dtype=np.int64)[:, None]
+        row_conflicts[start:start + m] = _pairs(rows + offsets * n, m, n)
+        diagonal_conflicts[start:start + m] = (_pairs(rows - cols + (n - 1) + offsets * lines, m, lines)
+                                               + _pairs(rows + cols + offsets * lines, m, lines))
+        in_range[start:start + m] = ok
+
+    row_conflicts[~in_range] = -1
+    diagonal_conflicts[~in_range] = -1
+    conflicts = np.where(in_range, row_conflicts + diagonal_conflicts, -1)
+    return {'valid': in_range & (conflicts == 0), 'row_conflicts': row_conflicts,
+            'diagonal_conflicts': diagonal_conflicts, 'conflicts': conflicts}
+
+
+def score_records(records, chunk_size=None, budget=BUDGET):
+    ''' (id, rows, error) records (as batch.read_jsonl / read_csv yield them)
+        to output dicts in input order, scoring up to chunk_size boards (by
+        default, up to budget cells of 2N per board) per pass '''
+    batch, cells = [], 0
+    for record in records:
+        batch.append(record)
+        rows = record[1]
+        cells += 2 * len(rows) if isinstance(rows, list) else 1
+        if len(batch) >= chunk_size if chunk_size is not None else cells >= budget:
+            yield from _score_batch(batch, budget)
+            batch, cells = [], 0
+    if batch:
+        yield from _score_batch(batch, budget)
+
+
+def _score_batch(batch, budget=BUDGET):
+    out = [None] * len(batch)
+    by_size = {}    # boards of one size are scored together
+    for i, (key, rows, error) in enumerate(batch):
+        if error is None and not (isinstance(rows, list) and rows and all(type(r) is int for r in rows)):
+            error = "rows must be a non-empty list of integers"
+        if error is not None:
+            out[i] = {'id': key, 'valid': False, 'error': error}
+        else:
+            by_size.setdefault(len(rows), []).append(i)
+    for indexes in by_size.values():
+        scores = score_boards([batch[i][1] for i in indexes], budget=budget)
+        for j, i in enumerate(indexes):
+            out[i] = {'id': batch[i][0], 'valid': bool(scores['valid'][j]),
+                      'row_conflicts': int(scores['row_conflicts'][j]),
+                      'diagonal_conflicts': int(scores['diagonal_conflicts'][j])}
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Check configurations (1-based rows, as in the app) for attacking queens '
+                    'and stream one JSON result per line.')
+    parser.add_argument('input', nargs='?', default='-', help="JSONL or CSV file, '-' for stdin")
+    parser.add_argument('--format', choices=('auto', 'jsonl', 'csv'), default='auto',
+                        help='input format (auto: by file extension, JSONL for stdin)')
+    parser.add_argument('--chunk-size', type=int, default=None,
+                        help=f'boards scored per pass (default: as many as fit {BUDGET} count-table cells)')
+    args = parser.parse_args(argv)
+
+    fmt = args.format
+    if fmt == 'auto':
+        fmt = 'csv' if args.input.lower().endswith('.csv') else 'jsonl'
+    source = sys.stdin if args.input == '-' else open(args.input, newline='')
+    try:
+        reader = read_csv(source) if fmt == 'csv' else read_jsonl(source)
+        for record in score_records(reader, args.chunk_size):
+            sys.stdout.write(json.dumps(record) + '\n')
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+
+if __name__ == '__main__':
+    main()